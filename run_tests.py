@@ -9,6 +9,12 @@ import sys
 import subprocess
 from pathlib import Path
 
+try:
+    import xdist  # noqa: F401
+    XDIST_AVAILABLE = True
+except ImportError:
+    XDIST_AVAILABLE = False
+
 
 def run_tests():
     """Run all tests with pytest."""
@@ -30,6 +36,11 @@ def run_tests():
         '--tb=short',            # Short traceback format
     ]
     
+    # Run test classes in parallel, keeping each class on one worker so
+    # its class-scoped fixtures are built once
+    if XDIST_AVAILABLE:
+        cmd += ['-n', 'auto', '--dist=loadgroup']
+    
     result = subprocess.run(cmd)
     
     print()
@@ -8,8 +8,14 @@ Base classes for all plugins:
 - Signal plugins
 """
 
-from .indicators import TechnicalIndicators
-
 __all__ = [
     'TechnicalIndicators',
 ]
+
+
+def __getattr__(name):
+    # Import the indicator stack (pandas/ta) only when it is actually used
+    if name == 'TechnicalIndicators':
+        from .indicators import TechnicalIndicators
+        return TechnicalIndicators
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
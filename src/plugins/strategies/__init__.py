@@ -8,6 +8,9 @@ To add a new strategy:
 2. Define a class that inherits from StrategyPlugin
 3. The class will be automatically discovered and registered
 
+Modules starting with an underscore (e.g. _grid_jit.py) are private helpers
+and are not scanned.
+
 Example:
     # src/plugins/strategies/my_strategy.py
     from plugins.base.strategy_plugin import StrategyPlugin
@@ -45,7 +48,7 @@ def discover_strategies():
     """
     strategies_dir = Path(__file__).parent
     strategy_files = [f for f in os.listdir(strategies_dir)
-                     if f.endswith('.py') and f != '__init__.py']
+                     if f.endswith('.py') and not f.startswith('_')]
 
     discovered = {}
 
@@ -0,0 +1,24 @@
+"""
+Ahead-of-Time Build for Grid Trading Kernels
+
+Compiles the grid kernels from _grid_jit.py into a native extension module
+(grid_kernels) next to this file, so the bot does not pay Numba JIT warmup
+on every start. Requires Numba at build time only.
+
+Usage (from the src/ directory):
+    python -m plugins.strategies._grid_aot_build
+"""
+
+from pathlib import Path
+from numba.pycc import CC
+from plugins.strategies._grid_jit import _grid_prices
+
+cc = CC('grid_kernels')
+cc.output_dir = str(Path(__file__).parent)
+
+cc.export('grid_prices', 'Tuple((f8[:], f8[:]))(f8, f8, i8)')(_grid_prices)
+
+
+if __name__ == '__main__':
+    cc.compile()
+    print(f"Built grid_kernels in {cc.output_dir}")
@@ -0,0 +1,44 @@
+"""
+Grid Trading Numeric Kernels
+
+Pure numeric helpers used by the grid trading strategy. Kernels are loaded
+from the first available backend:
+
+1. Ahead-of-time compiled module (built by _grid_aot_build.py), which avoids
+   any JIT warmup on startup
+2. Numba JIT with an on-disk cache
+3. Plain NumPy code with identical results
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed."""
+        def decorator(func):
+            return func
+        return decorator
+
+
+def _grid_prices(current_price, step, levels):
+    """
+    Calculate buy and sell grid prices around the current price.
+
+    Args:
+        current_price: Current market price
+        step: Price distance between adjacent grid levels
+        levels: Number of levels on each side
+
+    Returns:
+        Tuple of (buy_prices, sell_prices) float64 arrays, nearest level first
+    """
+    offsets = step * np.arange(1, levels + 1).astype(np.float64)
+    return current_price - offsets, current_price + offsets
+
+
+try:
+    from plugins.strategies.grid_kernels import grid_prices
+except ImportError:
+    grid_prices = njit(cache=True)(_grid_prices)
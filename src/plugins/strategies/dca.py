@@ -131,6 +131,7 @@ class DCAStrategy(StrategyPlugin):
         self.total_spent = 0.0
         self.purchase_count = 0
         self.pending_sell_order = None  # Track pending sell order
+        self._sell_price = None  # (inputs, target sell price) for the last purchase
         self.bot = None
 
         # Trailing state (for bot-managed trailing orders)
@@ -454,6 +455,7 @@ class DCAStrategy(StrategyPlugin):
                 sell_fee_percent=self.taker_fee,
                 profit_target_percent=self.profit_target
             )
+            self._sell_price = (self._sell_price_inputs(), sell_price)
 
             # Calculate what the actual profit will be at that sell price
             actual_profit = TechnicalIndicators.calculate_actual_profit_percent(
@@ -542,6 +544,9 @@ class DCAStrategy(StrategyPlugin):
         self.purchase_count = state.get('purchase_count', 0)
         self.pending_sell_order = state.get('pending_sell_order')
 
+        # Sell target is recomputed on first use for the restored purchase
+        self._sell_price = None
+
         # Restore trailing state
         if 'trailing_state' in state:
             self.trailing_state = state['trailing_state']
@@ -559,18 +564,30 @@ class DCAStrategy(StrategyPlugin):
         """
         Get the target sell price for current position.
 
+        The value is computed when the buy fills (or on first use after a
+        restore) and reused until the purchase price, fees or profit target
+        change.
+
         Returns:
             Target sell price accounting for fees and profit target
         """
         if not self.last_purchase_price:
             return 0.0
 
-        return TechnicalIndicators.calculate_sell_price_with_fees(
-            buy_price=self.last_purchase_price,
-            buy_fee_percent=self.maker_fee,
-            sell_fee_percent=self.taker_fee,
-            profit_target_percent=self.profit_target
-        )
+        inputs = self._sell_price_inputs()
+        if self._sell_price is None or self._sell_price[0] != inputs:
+            self._sell_price = (inputs, TechnicalIndicators.calculate_sell_price_with_fees(
+                buy_price=self.last_purchase_price,
+                buy_fee_percent=self.maker_fee,
+                sell_fee_percent=self.taker_fee,
+                profit_target_percent=self.profit_target
+            ))
+
+        return self._sell_price[1]
+
+    def _sell_price_inputs(self) -> tuple:
+        """Values the cached sell price depends on."""
+        return (self.last_purchase_price, self.maker_fee, self.taker_fee, self.profit_target)
 
     def start_trailing(self, direction: str, activation_price: float, trailing_percent: float):
         """
@@ -10,13 +10,36 @@ Enhanced with technical indicators to avoid blind buying/selling at poor entry p
 This strategy profits from market volatility and range-bound trading.
 """
 
-from typing import Dict, Any, List
+import logging
+from typing import Dict, Any, List, Tuple
+import numpy as np
 from plugins.base.strategy_plugin import StrategyPlugin
-from plugins.indicators import TechnicalIndicators
+from plugins.strategies._grid_jit import grid_prices
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Indicator stack (pandas/ta) is only needed when indicator validation runs,
+# so it is imported on first use by _technical_indicators()
+TechnicalIndicators = None
+
+
+def _technical_indicators():
+    """Import and return TechnicalIndicators on first use."""
+    global TechnicalIndicators
+    if TechnicalIndicators is None:
+        from plugins.indicators import TechnicalIndicators as indicators
+        TechnicalIndicators = indicators
+    return TechnicalIndicators
+
+# Banner line for grouped log output
+_BAR = "=" * 60
+
+# Side codes used by the columnar grid level arrays and fill handling
+SIDE_BUY = 0
+SIDE_SELL = 1
+SIDE_NAMES = ('buy', 'sell')
+
 
 class GridTradingStrategy(StrategyPlugin):
     """
@@ -29,6 +52,7 @@ class GridTradingStrategy(StrategyPlugin):
     - grid_spacing: Percentage spacing between grid levels (default: 2.5%)
     - grid_levels: Number of grid levels above and below current price (default: 10)
     - position_size: Position size in USD per grid level (default: 100)
+    - tick_size: Price granularity used to match orders by price (default: 0.00000001)
     - use_indicators_for_buy: Use indicators to validate buy orders (default: True)
     - use_indicators_for_sell: Use indicators to validate sell orders (default: False)
     - use_rsi: Use RSI indicator for buys (default: True)
@@ -52,6 +76,14 @@ class GridTradingStrategy(StrategyPlugin):
         self.grid_spacing = self.params.get('grid_spacing', 2.5)  # %
         self.grid_levels = self.params.get('grid_levels', 10)
         self.position_size = self.params.get('position_size', 100)  # USD
+        self.tick_size = self.params.get('tick_size', 1e-8)
+
+        # Spacing as multiplication factors, so fills don't redo the division
+        self._step_pct = self.grid_spacing / 100.0
+        self._up = 1.0 + self._step_pct
+        self._down = 1.0 - self._step_pct
+        # Price factor for the opposite order, indexed by the filled side code
+        self._fill_factors = (self._up, self._down)
 
         # Indicator settings
         self.use_indicators_for_buy = self.params.get('use_indicators_for_buy', True)
@@ -65,8 +97,18 @@ class GridTradingStrategy(StrategyPlugin):
 
         # State
         self.grid_orders = []  # List of active grid orders
+        self._price_index = {}  # Price tick -> indexes into grid_orders
         self.current_price = None
         self.bot = None
+        self._get_market_data = None  # Bot's market data accessor, bound in initialize()
+
+        # Indicator values for the latest OHLCV bar, shared by both validators
+        self._ind_cache = {}
+        self._ind_cache_ts = None
+
+        # Grid step (price distance between levels), cached per current_price
+        self._grid_step = None
+        self._grid_step_price = None
 
         logger.info(f"Enhanced Grid Trading Strategy initialized:")
         logger.info(f"  Grid spacing: {self.grid_spacing}%")
@@ -85,6 +127,7 @@ class GridTradingStrategy(StrategyPlugin):
             bot_instance: Reference to the bot engine
         """
         self.bot = bot_instance
+        self._get_market_data = getattr(bot_instance, 'get_market_data', None)
         logger.info("Grid Trading Strategy ready")
     
     def analyze(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -143,35 +186,52 @@ class GridTradingStrategy(StrategyPlugin):
             logger.error("Cannot place grid orders - no current price")
             return
         
-        logger.info("=" * 60)
-        logger.info("Placing Grid Orders")
-        logger.info("=" * 60)
-        
-        # Calculate grid levels
-        grid_levels = self._calculate_grid_levels()
-        
-        # Place orders at each level
-        for level in grid_levels:
-            price = level['price']
-            side = level['side']
-            
-            # Calculate amount based on position size
-            amount = self.position_size / price
-            
-            logger.info(f"  {side.upper()}: {amount:.8f} @ ${price:,.2f}")
-            
-            # Store order info (actual order placement would happen here)
-            self.grid_orders.append({
-                'price': price,
-                'side': side,
-                'amount': amount,
-                'status': 'pending'
-            })
-        
-        logger.info("=" * 60)
+        logger.debug("%s\nPlacing Grid Orders\n%s", _BAR, _BAR)
+
+        # Calculate grid levels as price/side columns
+        prices, sides = self._grid_level_arrays()
+
+        # Calculate amounts based on position size
+        amounts = np.divide(self.position_size, prices)
+
+        # Store order info at each level (actual order placement would happen here)
+        self.grid_orders = [
+            {'price': price, 'side': SIDE_NAMES[side_code], 'amount': amount, 'status': 'pending'}
+            for price, side_code, amount in zip(prices.tolist(), sides.tolist(), amounts.tolist())
+        ]
+        self._rebuild_price_index()
+
+        # One aggregated line instead of one log call per level
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Grid levels:\n%s\n%s", "\n".join(
+                f"  {o['side'].upper()}: {o['amount']:.8f} @ ${o['price']:,.2f}"
+                for o in self.grid_orders
+            ), _BAR)
+
         logger.info(f"✓ Placed {len(self.grid_orders)} grid orders")
-        logger.info("=" * 60)
     
+    def _grid_level_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate grid price levels as parallel arrays.
+
+        Returns:
+            Tuple of (prices, sides) where prices is a float64 array and sides
+            is a uint8 array of indexes into SIDE_NAMES. Buy levels (below
+            current price) come first, followed by sell levels.
+        """
+        # Price distance between levels only changes with current_price
+        if self._grid_step_price != self.current_price:
+            self._grid_step = self.current_price * self._step_pct
+            self._grid_step_price = self.current_price
+
+        buy_prices, sell_prices = grid_prices(
+            float(self.current_price), float(self._grid_step), int(self.grid_levels)
+        )
+        prices = np.concatenate((buy_prices, sell_prices))
+        sides = np.repeat(np.array([SIDE_BUY, SIDE_SELL], dtype=np.uint8), self.grid_levels)
+
+        return prices, sides
+
     def _calculate_grid_levels(self) -> List[Dict[str, Any]]:
         """
         Calculate grid price levels.
@@ -179,25 +239,12 @@ class GridTradingStrategy(StrategyPlugin):
         Returns:
             List of grid levels with price and side
         """
-        levels = []
-        
-        # Buy levels (below current price)
-        for i in range(1, self.grid_levels + 1):
-            price = self.current_price * (1 - (self.grid_spacing / 100) * i)
-            levels.append({
-                'price': price,
-                'side': 'buy'
-            })
-        
-        # Sell levels (above current price)
-        for i in range(1, self.grid_levels + 1):
-            price = self.current_price * (1 + (self.grid_spacing / 100) * i)
-            levels.append({
-                'price': price,
-                'side': 'sell'
-            })
-        
-        return levels
+        prices, sides = self._grid_level_arrays()
+
+        return [
+            {'price': price, 'side': SIDE_NAMES[side_code]}
+            for price, side_code in zip(prices.tolist(), sides.tolist())
+        ]
     
     def on_order_filled(self, order: Dict[str, Any]):
         """
@@ -209,55 +256,37 @@ class GridTradingStrategy(StrategyPlugin):
         Args:
             order: Order details
         """
-        logger.info("=" * 60)
-        logger.info(f"Order Filled: {order.get('side')} @ ${order.get('price'):,.2f}")
-        logger.info("=" * 60)
+        price = order.get('price')
+        side = order.get('side')
+        amount = order.get('amount')
+
+        logger.info(f"{_BAR}\nOrder Filled: {side} @ ${price:,.2f}\n{_BAR}")
 
         # Remove filled order from grid
-        self.grid_orders = [
-            o for o in self.grid_orders
-            if o.get('price') != order.get('price')
-        ]
+        self._remove_grid_order(price)
+
+        # Place opposite order: a buy fill places a sell above it,
+        # a sell fill places a buy below it
+        side_code = SIDE_BUY if side == 'buy' else SIDE_SELL
+        new_code = 1 - side_code
+        new_side = SIDE_NAMES[new_code]
+        new_price = price * self._fill_factors[side_code]
+
+        # Check indicators for the new order if enabled
+        use_indicators = (self.use_indicators_for_buy, self.use_indicators_for_sell)[new_code]
+        if use_indicators and not self._validate_indicators(is_buy=new_code == SIDE_BUY):
+            logger.info(f"{new_side.capitalize()} indicators not favorable - "
+                        f"skipping {new_side} order @ ${new_price:,.2f}\n{_BAR}")
+            return
+
+        logger.info(f"Placing {new_side.upper()} order @ ${new_price:,.2f}\n{_BAR}")
 
-        # Place opposite order
-        if order.get('side') == 'buy':
-            # Buy filled - place sell order above
-            sell_price = order.get('price') * (1 + self.grid_spacing / 100)
-
-            # Check indicators for sell if enabled
-            if self.use_indicators_for_sell and not self._validate_sell_indicators():
-                logger.info(f"Sell indicators not favorable - skipping sell order @ ${sell_price:,.2f}")
-                logger.info("=" * 60)
-                return
-
-            logger.info(f"Placing SELL order @ ${sell_price:,.2f}")
-
-            self.grid_orders.append({
-                'price': sell_price,
-                'side': 'sell',
-                'amount': order.get('amount'),
-                'status': 'pending'
-            })
-        else:
-            # Sell filled - place buy order below
-            buy_price = order.get('price') * (1 - self.grid_spacing / 100)
-
-            # Check indicators for buy if enabled
-            if self.use_indicators_for_buy and not self._validate_buy_indicators():
-                logger.info(f"Buy indicators not favorable - skipping buy order @ ${buy_price:,.2f}")
-                logger.info("=" * 60)
-                return
-
-            logger.info(f"Placing BUY order @ ${buy_price:,.2f}")
-
-            self.grid_orders.append({
-                'price': buy_price,
-                'side': 'buy',
-                'amount': order.get('amount'),
-                'status': 'pending'
-            })
-
-        logger.info("=" * 60)
+        self._add_grid_order({
+            'price': new_price,
+            'side': new_side,
+            'amount': amount,
+            'status': 'pending'
+        })
     
     def on_order_cancelled(self, order: Dict[str, Any]):
         """
@@ -266,13 +295,73 @@ class GridTradingStrategy(StrategyPlugin):
         Args:
             order: Order details
         """
-        logger.warning(f"Order cancelled: {order.get('side')} @ ${order.get('price'):,.2f}")
+        price = order.get('price')
+
+        logger.warning(f"Order cancelled: {order.get('side')} @ ${price:,.2f}")
         
         # Remove from grid
-        self.grid_orders = [
-            o for o in self.grid_orders 
-            if o.get('price') != order.get('price')
-        ]
+        self._remove_grid_order(price)
+
+    def _price_key(self, price: float) -> int:
+        """
+        Get the index key for a grid price.
+
+        Prices are quantized to integer ticks so that floating point drift
+        between derived grid prices does not break exact matching.
+
+        Args:
+            price: Order price
+
+        Returns:
+            Price expressed as a whole number of ticks
+        """
+        return int(round(price / self.tick_size))
+
+    def _add_grid_order(self, grid_order: Dict[str, Any]):
+        """
+        Append an order to the grid and index it by price.
+
+        An order at an already indexed price is kept alongside the existing
+        ones, as the list-based grid did.
+
+        Args:
+            grid_order: Grid order dictionary
+        """
+        key = self._price_key(grid_order['price'])
+        self._price_index.setdefault(key, []).append(len(self.grid_orders))
+        self.grid_orders.append(grid_order)
+
+    def _remove_grid_order(self, price: float):
+        """
+        Remove every grid order at the given price.
+
+        Each removed order is replaced by the last one, so grid_orders
+        does not preserve insertion order after removals.
+
+        Args:
+            price: Price of the orders to remove
+        """
+        if price is None:
+            return
+
+        positions = self._price_index.pop(self._price_key(price), None)
+        if positions is None:
+            return
+
+        # Highest slot first, so the order moved in from the end is never
+        # one that is still waiting to be removed
+        for idx in sorted(positions, reverse=True):
+            last = self.grid_orders.pop()
+            if idx < len(self.grid_orders):
+                self.grid_orders[idx] = last
+                moved = self._price_index[self._price_key(last['price'])]
+                moved[moved.index(len(self.grid_orders))] = idx
+
+    def _rebuild_price_index(self):
+        """Rebuild the price index from grid_orders."""
+        self._price_index = {}
+        for i, o in enumerate(self.grid_orders):
+            self._price_index.setdefault(self._price_key(o['price']), []).append(i)
     
     def get_state(self) -> Dict[str, Any]:
         """
@@ -295,84 +384,64 @@ class GridTradingStrategy(StrategyPlugin):
         """
         self.grid_orders = state.get('grid_orders', [])
         self.current_price = state.get('current_price')
+        self._rebuild_price_index()
 
         logger.info(f"State restored: {len(self.grid_orders)} grid orders")
 
-    def _validate_buy_indicators(self) -> bool:
-        """
-        Validate if indicators support buying.
-
-        Returns:
-            True if indicators are favorable for buying
+    def _cached_indicator(self, df, name: str):
         """
-        if not self.bot or not hasattr(self.bot, 'get_market_data'):
-            logger.warning("Cannot validate indicators - no market data available")
-            return True  # Default to allowing the trade
-
-        try:
-            market_data = self.bot.get_market_data()
-            df = market_data.get('ohlcv')
-
-            if df is None or len(df) < 50:
-                logger.warning("Insufficient OHLCV data for indicator validation")
-                return True  # Default to allowing the trade
+        Get an indicator value, computing it at most once per OHLCV bar.
 
-            signals = []
+        Fills can arrive several times within the same bar, so values are
+        cached until the last candle of the OHLCV data changes.
 
-            # RSI oversold check
-            if self.use_rsi:
-                rsi, _ = TechnicalIndicators.get_rsi(df)
-                if rsi <= self.rsi_oversold:
-                    signals.append(True)
-                    logger.info(f"  ✓ RSI oversold: {rsi:.1f}")
-                else:
-                    signals.append(False)
-                    logger.info(f"  ✗ RSI not oversold: {rsi:.1f}")
-
-            # MACD rising check
-            if self.use_macd:
-                if TechnicalIndicators.is_macd_rising(df):
-                    signals.append(True)
-                    logger.info(f"  ✓ MACD rising")
-                else:
-                    signals.append(False)
-                    logger.info(f"  ✗ MACD not rising")
-
-            # Price below EMA check
-            if self.use_ema:
-                if TechnicalIndicators.is_price_below_ema(df, length=self.ema_length):
-                    signals.append(True)
-                    logger.info(f"  ✓ Price below EMA")
-                else:
-                    signals.append(False)
-                    logger.info(f"  ✗ Price above EMA")
-
-            # Need at least 50% of indicators to agree
-            if not signals:
-                return True  # No indicators enabled
-
-            positive = sum(signals)
-            total = len(signals)
+        Args:
+            df: OHLCV DataFrame
+            name: Indicator name ('rsi', 'macd_rising' or 'price_below_ema')
 
-            return positive >= (total * 0.5)
+        Returns:
+            Indicator value
+        """
+        ts = df['timestamp'].iloc[-1] if 'timestamp' in df.columns else df.index[-1]
+        if ts != self._ind_cache_ts:
+            self._ind_cache = {}
+            self._ind_cache_ts = ts
+
+        if name not in self._ind_cache:
+            TechnicalIndicators = _technical_indicators()
+            if name == 'rsi':
+                value, _ = TechnicalIndicators.get_rsi(df)
+            elif name == 'macd_rising':
+                value = TechnicalIndicators.is_macd_rising(df)
+            elif name == 'price_below_ema':
+                value = TechnicalIndicators.is_price_below_ema(df, length=self.ema_length)
+            else:
+                raise ValueError(f"Unknown indicator: {name}")
+            self._ind_cache[name] = value
+
+        return self._ind_cache[name]
+
+    def _validate_indicators(self, is_buy: bool) -> bool:
+        """
+        Validate if indicators support placing a buy or sell order.
 
-        except Exception as e:
-            logger.error(f"Error validating buy indicators: {e}")
-            return True  # Default to allowing the trade on error
+        Buys look for RSI oversold, MACD rising and (optionally) price below
+        EMA. Sells look for RSI overbought and MACD falling.
 
-    def _validate_sell_indicators(self) -> bool:
-        """
-        Validate if indicators support selling.
+        Args:
+            is_buy: True to validate a buy, False to validate a sell
 
         Returns:
-            True if indicators are favorable for selling
+            True if at least 50% of the enabled indicators are favorable
         """
-        if not self.bot or not hasattr(self.bot, 'get_market_data'):
+        side = 'buy' if is_buy else 'sell'
+
+        if self._get_market_data is None:
             logger.warning("Cannot validate indicators - no market data available")
             return True  # Default to allowing the trade
 
         try:
-            market_data = self.bot.get_market_data()
+            market_data = self._get_market_data()
             df = market_data.get('ohlcv')
 
             if df is None or len(df) < 50:
@@ -380,36 +449,44 @@ class GridTradingStrategy(StrategyPlugin):
                 return True  # Default to allowing the trade
 
             signals = []
+            checks = []
 
-            # RSI overbought check
+            # RSI oversold (buy) / overbought (sell) check
             if self.use_rsi:
-                rsi, _ = TechnicalIndicators.get_rsi(df)
-                if rsi >= self.rsi_overbought:
-                    signals.append(True)
-                    logger.info(f"  ✓ RSI overbought: {rsi:.1f}")
+                rsi = self._cached_indicator(df, 'rsi')
+                if is_buy:
+                    ok = rsi <= self.rsi_oversold
+                    checks.append(f"✓ RSI oversold: {rsi:.1f}" if ok else f"✗ RSI not oversold: {rsi:.1f}")
                 else:
-                    signals.append(False)
-                    logger.info(f"  ✗ RSI not overbought: {rsi:.1f}")
+                    ok = rsi >= self.rsi_overbought
+                    checks.append(f"✓ RSI overbought: {rsi:.1f}" if ok else f"✗ RSI not overbought: {rsi:.1f}")
+                signals.append(ok)
 
-            # MACD falling check (negative for sell)
+            # MACD rising (buy) / falling (sell) check
             if self.use_macd:
-                if not TechnicalIndicators.is_macd_rising(df):
-                    signals.append(True)
-                    logger.info(f"  ✓ MACD falling")
+                rising = self._cached_indicator(df, 'macd_rising')
+                if is_buy:
+                    ok = rising
+                    checks.append("✓ MACD rising" if ok else "✗ MACD not rising")
                 else:
-                    signals.append(False)
-                    logger.info(f"  ✗ MACD still rising")
+                    ok = not rising
+                    checks.append("✓ MACD falling" if ok else "✗ MACD still rising")
+                signals.append(ok)
+
+            # Price below EMA check (buys only)
+            if is_buy and self.use_ema:
+                ok = self._cached_indicator(df, 'price_below_ema')
+                checks.append("✓ Price below EMA" if ok else "✗ Price above EMA")
+                signals.append(ok)
 
             # Need at least 50% of indicators to agree
             if not signals:
                 return True  # No indicators enabled
 
-            positive = sum(signals)
-            total = len(signals)
+            logger.info(f"  {side.capitalize()} indicators: {', '.join(checks)}")
 
-            return positive >= (total * 0.5)
+            return sum(signals) >= (len(signals) * 0.5)
 
         except Exception as e:
-            logger.error(f"Error validating sell indicators: {e}")
+            logger.error(f"Error validating {side} indicators: {e}")
             return True  # Default to allowing the trade on error
-
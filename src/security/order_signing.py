@@ -20,17 +20,30 @@ This ensures:
 - Only the holder of the secret can create valid requests
 """
 
+import base64
 import hmac
 import hashlib
-import time
+import re
 import json
-from typing import Dict, Any, Optional, Tuple
+import threading
+from time import time_ns
+from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import urlencode
 from abc import ABC, abstractmethod
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Characters urlencode() leaves untouched; strings made only of these can be
+# joined into a query string directly
+_QUERY_SAFE = re.compile(r'[A-Za-z0-9_.~\-]*')
+
+# Canonical form of hexdigest() output; verify_signature() accepts only this
+_LOWER_HEX = re.compile(r'[0-9a-f]+')
+
+_b64encode = base64.b64encode
+_b64decode = base64.b64decode
+
 
 class OrderSigner(ABC):
     """
@@ -102,6 +115,9 @@ class HMACOrderSigner(OrderSigner):
         timestamp + method + endpoint + body
     """
     
+    # Maximum number of secrets with a cached pre-keyed HMAC
+    _SECRET_CACHE_SIZE = 8
+    
     def __init__(self, hash_algo: str = 'sha256'):
         """
         Initialize HMAC signer.
@@ -111,6 +127,14 @@ class HMACOrderSigner(OrderSigner):
         """
         self.hash_algo = hash_algo
         self.hash_func = getattr(hashlib, hash_algo)
+
+        # Pre-keyed HMAC objects per secret, copied for each signature so the
+        # key setup is done once. The raw secrets are the dict keys. Signers
+        # from get_order_signer() are shared for the life of the process, so
+        # up to _SECRET_CACHE_SIZE secrets stay in memory that long.
+        self._secret_cache: Dict[str, hmac.HMAC] = {}
+        # Serializes cache misses; signers are shared across bot threads
+        self._secret_cache_lock = threading.Lock()
     
     def sign_request(
         self,
@@ -129,19 +153,12 @@ class HMACOrderSigner(OrderSigner):
         4. Sign query string with HMAC-SHA256
         5. Add signature to params
         """
-        # Add timestamp (milliseconds)
-        timestamp = int(time.time() * 1000)
-        params['timestamp'] = timestamp
-        
-        # Create query string (sorted alphabetically)
-        query_string = self._create_query_string(params)
+        # Add timestamp (and any exchange-specific params)
+        self._prepare_params(params)
         
-        # Sign the query string
-        signature = self._sign_message(query_string, api_secret)
-        
-        # Add signature to params
+        # Sign a copy so the caller's params don't get the signature
         signed_params = params.copy()
-        signed_params['signature'] = signature
+        self._sign_into(signed_params, api_secret)
         
         # Headers (if needed)
         headers = {
@@ -152,6 +169,126 @@ class HMACOrderSigner(OrderSigner):
         
         return signed_params, headers
     
+    def sign_request_inplace(
+        self,
+        method: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        api_secret: str
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Sign request by adding the signature directly to params.
+        
+        Same signing as sign_request(), without copying params. The caller
+        owns params and must not reuse it for another request.
+        
+        Returns:
+            Tuple of (params, headers)
+        """
+        # Add timestamp (and any exchange-specific params)
+        self._prepare_params(params)
+        
+        self._sign_into(params, api_secret)
+        
+        headers = {
+            'X-MBX-APIKEY': '',  # API key should be added by caller
+        }
+        
+        logger.debug(f"Signed {method} request to {endpoint}")
+        
+        return params, headers
+    
+    def sign_request_str(
+        self,
+        method: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        api_secret: str
+    ) -> Tuple[str, Dict[str, str]]:
+        """
+        Sign request and return the signed query string directly.
+        
+        Same signing as sign_request(), for callers that send the query
+        string as-is and don't need a signed params dict.
+        
+        Returns:
+            Tuple of (signed_query_string, headers)
+        """
+        # Add timestamp (and any exchange-specific params)
+        self._prepare_params(params)
+        
+        query_string = self._create_query_string(params)
+        signature = self._sign_message(query_string, api_secret)
+        
+        headers = {
+            'X-MBX-APIKEY': '',  # API key should be added by caller
+        }
+        
+        logger.debug(f"Signed {method} request to {endpoint}")
+        
+        return f"{query_string}&signature={signature}", headers
+    
+    def sign_batch(
+        self,
+        requests: List[Tuple[str, str, Dict[str, Any]]],
+        api_secret: str
+    ) -> List[Tuple[Dict[str, Any], Dict[str, str]]]:
+        """
+        Sign a burst of requests with the same secret.
+        
+        Equivalent to calling sign_request() for each request, but the
+        secret lookup and per-call overhead are paid once for the batch
+        (e.g. cancel-all or rebalance bursts).
+        
+        Args:
+            requests: List of (method, endpoint, params) tuples
+            api_secret: API secret key
+            
+        Returns:
+            List of (signed_params, headers) tuples, in request order
+        """
+        proto = self._keyed_hmac(api_secret)
+        create_query_string = self._create_query_string
+        
+        signed = []
+        for method, endpoint, params in requests:
+            self._prepare_params(params)
+            
+            h = proto.copy()
+            h.update(create_query_string(params).encode('utf-8'))
+            
+            signed_params = params.copy()
+            signed_params['signature'] = h.hexdigest()
+            signed.append((signed_params, {'X-MBX-APIKEY': ''}))
+        
+        logger.debug(f"Signed batch of {len(signed)} requests")
+        
+        return signed
+    
+    def _sign_into(self, params: Dict[str, Any], api_secret: str):
+        """
+        Sign prepared params and add the signature to them in place.
+        
+        Args:
+            params: Request parameters (timestamp already added)
+            api_secret: API secret key
+        """
+        # Create query string (sorted alphabetically)
+        query_string = self._create_query_string(params)
+        
+        # Sign the query string
+        params['signature'] = self._sign_message(query_string, api_secret)
+    
+    def _prepare_params(self, params: Dict[str, Any]):
+        """
+        Add signing params (timestamp) to request params in place.
+        
+        Args:
+            params: Request parameters
+        """
+        # Timestamp in milliseconds
+        params['timestamp'] = time_ns() // 1_000_000
+    
     def _create_query_string(self, params: Dict[str, Any]) -> str:
         """
         Create query string from parameters.
@@ -162,13 +299,19 @@ class HMACOrderSigner(OrderSigner):
         Returns:
             URL-encoded query string
         """
-        # Sort parameters alphabetically
-        sorted_params = sorted(params.items())
+        # Sort parameter names alphabetically
+        keys = sorted(params)
         
-        # URL encode
-        query_string = urlencode(sorted_params)
+        # Fast path: typical params (symbols, numbers, enums) need no escaping
+        parts = [None] * len(keys)
+        for i, key in enumerate(keys):
+            name, value = str(key), str(params[key])
+            if not (_QUERY_SAFE.fullmatch(name) and _QUERY_SAFE.fullmatch(value)):
+                # URL encode
+                return urlencode([(k, params[k]) for k in keys])
+            parts[i] = f"{name}={value}"
         
-        return query_string
+        return '&'.join(parts)
     
     def _sign_message(self, message: str, secret: str) -> str:
         """
@@ -181,13 +324,33 @@ class HMACOrderSigner(OrderSigner):
         Returns:
             Hex-encoded signature
         """
-        signature = hmac.new(
-            secret.encode('utf-8'),
-            message.encode('utf-8'),
-            self.hash_func
-        ).hexdigest()
+        h = self._keyed_hmac(secret).copy()
+        h.update(message.encode('utf-8'))
         
-        return signature
+        return h.hexdigest()
+    
+    def _keyed_hmac(self, secret: str) -> hmac.HMAC:
+        """
+        Get a pre-keyed HMAC object for a secret.
+        
+        Args:
+            secret: Secret key
+            
+        Returns:
+            HMAC object with no message data, to be copied before use
+        """
+        proto = self._secret_cache.get(secret)
+        if proto is None:
+            with self._secret_cache_lock:
+                proto = self._secret_cache.get(secret)
+                if proto is None:
+                    if len(self._secret_cache) >= self._SECRET_CACHE_SIZE:
+                        # Drop the oldest secret
+                        self._secret_cache.pop(next(iter(self._secret_cache)))
+                    proto = hmac.new(secret.encode('utf-8'), digestmod=self.hash_algo)
+                    self._secret_cache[secret] = proto
+        
+        return proto
     
     def verify_signature(
         self,
@@ -206,10 +369,21 @@ class HMACOrderSigner(OrderSigner):
         Returns:
             True if signature is valid
         """
-        expected_signature = self._sign_message(message, api_secret)
+        h = self._keyed_hmac(api_secret).copy()
+        h.update(message.encode('utf-8'))
+        
+        # Only accept exactly what hexdigest() produces. bytes.fromhex() alone
+        # would also take uppercase hex and whitespace between bytes.
+        if not (
+            isinstance(signature, str)
+            and len(signature) == 2 * h.digest_size
+            and _LOWER_HEX.fullmatch(signature)
+        ):
+            return False
+        provided = bytes.fromhex(signature)
         
-        # Use constant-time comparison to prevent timing attacks
-        return hmac.compare_digest(signature, expected_signature)
+        # Use constant-time comparison of the raw digests to prevent timing attacks
+        return hmac.compare_digest(provided, h.digest())
 
 
 class BinanceOrderSigner(HMACOrderSigner):
@@ -232,22 +406,15 @@ class BinanceOrderSigner(HMACOrderSigner):
         super().__init__(hash_algo='sha256')
         self.recv_window = recv_window
     
-    def sign_request(
-        self,
-        method: str,
-        endpoint: str,
-        params: Dict[str, Any],
-        api_secret: str
-    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    def _prepare_params(self, params: Dict[str, Any]):
         """
-        Sign request for Binance API.
+        Add Binance signing params (recvWindow, timestamp) in place.
         """
         # Add recvWindow if not present
         if 'recvWindow' not in params:
             params['recvWindow'] = self.recv_window
         
-        # Use parent HMAC signing
-        return super().sign_request(method, endpoint, params, api_secret)
+        super()._prepare_params(params)
 
 
 class CoinbaseOrderSigner(OrderSigner):
@@ -263,6 +430,18 @@ class CoinbaseOrderSigner(OrderSigner):
     Message format: timestamp + method + endpoint + body
     """
     
+    # Maximum number of cached decoded secrets
+    _SECRET_CACHE_SIZE = 8
+    
+    def __init__(self):
+        """Initialize Coinbase signer."""
+        # Base64-decoded secrets, keyed by the raw secret. Signers from
+        # get_order_signer() are shared for the life of the process, so up to
+        # _SECRET_CACHE_SIZE secrets stay in memory that long.
+        self._decoded_secrets: Dict[str, bytes] = {}
+        # Serializes cache misses; signers are shared across bot threads
+        self._decoded_secrets_lock = threading.Lock()
+    
     def sign_request(
         self,
         method: str,
@@ -284,10 +463,9 @@ class CoinbaseOrderSigner(OrderSigner):
         Returns:
             Tuple of (params, headers)
         """
-        import base64
-        
-        # Timestamp (seconds with decimal)
-        timestamp = str(time.time())
+        # Timestamp (seconds with microsecond decimals, built without float rounding)
+        micros = time_ns() // 1000
+        timestamp = f"{micros // 1_000_000}.{micros % 1_000_000:06d}"
         
         # Create message
         if method == 'GET':
@@ -297,18 +475,28 @@ class CoinbaseOrderSigner(OrderSigner):
         
         message = timestamp + method + endpoint + body
         
-        # Decode secret from base64
-        secret_decoded = base64.b64decode(api_secret)
+        # Decode secret from base64 (once per secret)
+        secret_decoded = self._decoded_secrets.get(api_secret)
+        if secret_decoded is None:
+            with self._decoded_secrets_lock:
+                secret_decoded = self._decoded_secrets.get(api_secret)
+                if secret_decoded is None:
+                    if len(self._decoded_secrets) >= self._SECRET_CACHE_SIZE:
+                        # Drop the oldest secret
+                        self._decoded_secrets.pop(next(iter(self._decoded_secrets)))
+                    secret_decoded = _b64decode(api_secret)
+                    self._decoded_secrets[api_secret] = secret_decoded
         
-        # Sign message
-        signature = hmac.new(
+        # Sign message. hashlib/hmac's OpenSSL C path is faster than
+        # cryptography's hazmat HMAC for small messages like these.
+        signature = hmac.digest(
             secret_decoded,
             message.encode('utf-8'),
-            hashlib.sha256
-        ).digest()
+            'sha256'
+        )
         
         # Encode signature to base64
-        signature_b64 = base64.b64encode(signature).decode()
+        signature_b64 = _b64encode(signature).decode()
         
         # Create headers
         headers = {
@@ -334,24 +522,47 @@ class CoinbaseOrderSigner(OrderSigner):
         raise NotImplementedError("Coinbase signature verification not implemented")
 
 
+# Signers are stateless with respect to request data (everything per-request
+# is in the call's params), so one instance per exchange id is shared by all
+# bots for the life of the process. Their only state is the bounded,
+# lock-protected per-secret key cache, which holds the raw secrets.
+_SIGNER_CACHE: Dict[str, OrderSigner] = {}
+
+_BINANCE_IDS = frozenset({'binance', 'binance_us', 'binanceus'})
+_COINBASE_IDS = frozenset({'coinbase', 'coinbasepro', 'coinbase_pro'})
+
+
 def get_order_signer(exchange: str) -> OrderSigner:
     """
     Get the appropriate order signer for an exchange.
     
+    Signers are created once per exchange id and reused on later calls.
+    
     Args:
         exchange: Exchange identifier (binance, coinbase, etc.)
         
     Returns:
         OrderSigner instance
     """
-    exchange = exchange.lower()
-    
-    if exchange in ['binance', 'binance_us', 'binanceus']:
-        return BinanceOrderSigner()
-    elif exchange in ['coinbase', 'coinbasepro', 'coinbase_pro']:
-        return CoinbaseOrderSigner()
-    else:
-        # Default to HMAC signer
-        logger.warning(f"No specific signer for {exchange}, using HMAC-SHA256")
-        return HMACOrderSigner()
-
+    # Exchange ids are usually passed in the same spelling every time, so
+    # look the raw id up before normalizing it
+    signer = _SIGNER_CACHE.get(exchange)
+    if signer is not None:
+        return signer
+    
+    exchange_id = exchange.lower()
+    signer = _SIGNER_CACHE.get(exchange_id)
+    
+    if signer is None:
+        if exchange_id in _BINANCE_IDS:
+            signer = BinanceOrderSigner()
+        elif exchange_id in _COINBASE_IDS:
+            signer = CoinbaseOrderSigner()
+        else:
+            # Default to HMAC signer
+            logger.warning(f"No specific signer for {exchange_id}, using HMAC-SHA256")
+            signer = HMACOrderSigner()
+        _SIGNER_CACHE[exchange_id] = signer
+    
+    _SIGNER_CACHE[exchange] = signer
+    return signer
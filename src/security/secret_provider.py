@@ -13,12 +13,22 @@ Keys are NEVER logged.
 Keys are stored encrypted at rest.
 """
 
+import functools
+import json
+import os
 import platform
+import time
 import keyring
-from typing import Optional, Tuple
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 from abc import ABC, abstractmethod
 from utils.logger import get_logger
 
+try:
+    from cryptography.fernet import Fernet
+except ImportError:  # Only needed by the encrypted file fallback
+    Fernet = None
+
 logger = get_logger(__name__)
 
 
@@ -108,6 +118,41 @@ class KeyringSecretProvider(SecretProvider):
 
     SERVICE_NAME = 'KryptoMF_Bot'
 
+    # Keychain entries per exchange: the current single-entry layout first,
+    # then the legacy one-entry-per-field layout
+    _KEY_SUFFIXES = ('_creds', '_api_key', '_api_secret', '_passphrase')
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _key_names(exchange_id: str) -> Tuple[str, str, str, str]:
+        """
+        Keychain entry names for an exchange, built once per exchange id.
+
+        Returns:
+            Tuple of (creds, api_key, api_secret, passphrase) entry names
+        """
+        return tuple(
+            f"{exchange_id}{suffix}"
+            for suffix in KeyringSecretProvider._KEY_SUFFIXES
+        )
+
+    def __init__(self, cache_ttl: float = 300):
+        """
+        Initialize keyring provider.
+
+        Args:
+            cache_ttl: Seconds to keep retrieved credentials in memory, to avoid
+                repeated OS keychain round-trips (default: 300, 0 disables)
+        """
+        self.cache_ttl = cache_ttl
+
+        # exchange_id -> (retrieved_at, credentials). Held only by this
+        # instance and never logged.
+        self._cache: Dict[str, Tuple[float, Tuple[str, str, Optional[str]]]] = {}
+
+        # Contents of the _exchanges_list entry, loaded on first use
+        self._exchanges: Optional[list] = None
+
     def store_key(
         self,
         exchange_id: str,
@@ -125,29 +170,24 @@ class KeyringSecretProvider(SecretProvider):
             passphrase: API passphrase (optional, for Coinbase Pro, KuCoin, etc.)
         """
         logger.info(f"Storing credentials for {exchange_id} in OS keychain")
+        self._cache.pop(exchange_id, None)
 
-        # Store API key
-        keyring.set_password(
-            self.SERVICE_NAME,
-            f"{exchange_id}_api_key",
-            api_key
-        )
-
-        # Store API secret
+        # Store all fields as one entry so each store is a single keychain write
+        blob = {'k': api_key, 's': api_secret}
+        if passphrase:
+            blob['p'] = passphrase
         keyring.set_password(
             self.SERVICE_NAME,
-            f"{exchange_id}_api_secret",
-            api_secret
+            self._key_names(exchange_id)[0],
+            json.dumps(blob)
         )
 
-        # Store passphrase if provided
-        if passphrase:
-            keyring.set_password(
-                self.SERVICE_NAME,
-                f"{exchange_id}_passphrase",
-                passphrase
-            )
-            logger.debug(f"Stored passphrase for {exchange_id}")
+        # Drop any legacy per-field entries so a replaced secret doesn't linger
+        for key_name in self._key_names(exchange_id)[1:]:
+            try:
+                keyring.delete_password(self.SERVICE_NAME, key_name)
+            except keyring.errors.PasswordDeleteError:
+                pass  # No legacy entry for this field
 
         # Add to exchanges list
         self._add_to_exchanges_list(exchange_id)
@@ -162,27 +202,38 @@ class KeyringSecretProvider(SecretProvider):
             Tuple of (api_key, api_secret, passphrase) or None if not found
             passphrase will be None if not stored
         """
-        logger.debug(f"Retrieving credentials for {exchange_id}")
+        cached = self._cache.get(exchange_id)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
 
-        api_key = keyring.get_password(
-            self.SERVICE_NAME,
-            f"{exchange_id}_api_key"
-        )
+        logger.debug(f"Retrieving credentials for {exchange_id}")
 
-        api_secret = keyring.get_password(
+        blob = keyring.get_password(
             self.SERVICE_NAME,
-            f"{exchange_id}_api_secret"
+            self._key_names(exchange_id)[0]
         )
 
-        # Try to get passphrase (may not exist for all exchanges)
-        passphrase = keyring.get_password(
-            self.SERVICE_NAME,
-            f"{exchange_id}_passphrase"
-        )
+        if blob:
+            try:
+                creds = json.loads(blob)
+            except ValueError:
+                creds = None
+            if not isinstance(creds, dict):
+                logger.error(f"Corrupt credentials entry for {exchange_id}")
+                return None
+            api_key = creds.get('k')
+            api_secret = creds.get('s')
+            passphrase = creds.get('p')
+        else:
+            # Fall back to the legacy one-entry-per-field layout
+            api_key, api_secret, passphrase = self._get_legacy_key(exchange_id)
 
         if api_key and api_secret:
             logger.debug(f"✓ Credentials retrieved for {exchange_id}")
-            return (api_key, api_secret, passphrase)
+            credentials = (api_key, api_secret, passphrase)
+            if self.cache_ttl > 0:
+                self._cache[exchange_id] = (time.monotonic(), credentials)
+            return credentials
         else:
             logger.warning(f"No credentials found for {exchange_id}")
             return None
@@ -192,55 +243,78 @@ class KeyringSecretProvider(SecretProvider):
         Delete API credentials from OS keychain.
         """
         logger.info(f"Deleting credentials for {exchange_id}")
+        self._cache.pop(exchange_id, None)
 
-        try:
-            keyring.delete_password(
-                self.SERVICE_NAME,
-                f"{exchange_id}_api_key"
-            )
-            keyring.delete_password(
-                self.SERVICE_NAME,
-                f"{exchange_id}_api_secret"
-            )
-
-            # Try to delete passphrase (may not exist)
+        deleted = False
+        for key_name in self._key_names(exchange_id):
             try:
                 keyring.delete_password(
                     self.SERVICE_NAME,
-                    f"{exchange_id}_passphrase"
+                    key_name
                 )
+                deleted = True
             except keyring.errors.PasswordDeleteError:
-                pass  # Passphrase didn't exist, that's OK
+                pass  # Entry didn't exist (e.g. no passphrase, or legacy layout)
 
+        if deleted:
             # Remove from exchanges list
             self._remove_from_exchanges_list(exchange_id)
 
             logger.info(f"✓ Credentials deleted for {exchange_id}")
-        except keyring.errors.PasswordDeleteError:
+        else:
             logger.warning(f"No credentials found to delete for {exchange_id}")
-    
+
+    def _get_legacy_key(self, exchange_id: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Read credentials stored one keychain entry per field."""
+        _, api_key_name, api_secret_name, passphrase_name = self._key_names(exchange_id)
+
+        api_key = keyring.get_password(self.SERVICE_NAME, api_key_name)
+        api_secret = keyring.get_password(self.SERVICE_NAME, api_secret_name)
+
+        # Try to get passphrase (may not exist for all exchanges)
+        passphrase = keyring.get_password(self.SERVICE_NAME, passphrase_name)
+
+        return api_key, api_secret, passphrase
+
     def list_exchanges(self) -> list:
         """
         List exchanges with stored credentials.
 
         Note: Keyring doesn't provide a way to list all stored credentials,
-        so we maintain a list in a separate key.
+        so we maintain a list in a separate key. It is read once and then
+        served from memory; store/delete re-read it before changing it.
+        """
+        if self._exchanges is None:
+            try:
+                self._exchanges = self._read_exchanges_list()
+            except Exception as e:
+                logger.error(f"Error listing exchanges: {e}")
+                return []
+
+        return list(self._exchanges)
+
+    def _read_exchanges_list(self) -> list:
+        """Read the list of stored exchanges from the keychain."""
+        exchanges_str = keyring.get_password(
+            self.SERVICE_NAME,
+            "_exchanges_list"
+        )
+        return exchanges_str.split(',') if exchanges_str else []
+
+    def _current_exchanges_list(self) -> list:
+        """
+        Re-read the exchanges list before changing it, so entries added by
+        other instances or processes aren't overwritten with a stale copy.
         """
         try:
-            exchanges_str = keyring.get_password(
-                self.SERVICE_NAME,
-                "_exchanges_list"
-            )
-            if exchanges_str:
-                return exchanges_str.split(',')
-            return []
+            return self._read_exchanges_list()
         except Exception as e:
             logger.error(f"Error listing exchanges: {e}")
             return []
 
     def _add_to_exchanges_list(self, exchange_id: str):
         """Add exchange to the list of stored exchanges."""
-        exchanges = self.list_exchanges()
+        exchanges = self._current_exchanges_list()
         if exchange_id not in exchanges:
             exchanges.append(exchange_id)
             keyring.set_password(
@@ -248,10 +322,11 @@ class KeyringSecretProvider(SecretProvider):
                 "_exchanges_list",
                 ','.join(exchanges)
             )
+        self._exchanges = exchanges
 
     def _remove_from_exchanges_list(self, exchange_id: str):
         """Remove exchange from the list of stored exchanges."""
-        exchanges = self.list_exchanges()
+        exchanges = self._current_exchanges_list()
         if exchange_id in exchanges:
             exchanges.remove(exchange_id)
             if exchanges:
@@ -265,6 +340,7 @@ class KeyringSecretProvider(SecretProvider):
                     keyring.delete_password(self.SERVICE_NAME, "_exchanges_list")
                 except:
                     pass
+        self._exchanges = exchanges
 
 
 class EncryptedFileProvider(SecretProvider):
@@ -284,12 +360,11 @@ class EncryptedFileProvider(SecretProvider):
         Args:
             storage_path: Path to store encrypted credentials file
         """
-        from cryptography.fernet import Fernet
-        import json
-        from pathlib import Path
-
-        self.json = json
-        self.Fernet = Fernet
+        if Fernet is None:
+            raise ImportError(
+                "Encrypted file storage requires the 'cryptography' package "
+                "(pip install cryptography)"
+            )
 
         if storage_path is None:
             # Use user's home directory
@@ -303,6 +378,11 @@ class EncryptedFileProvider(SecretProvider):
         self.key = self._get_or_create_key()
         self.cipher = Fernet(self.key)
 
+        # Decrypted credentials, kept in memory for reads while the file is
+        # unchanged. Changes are always written straight back to the file.
+        self._creds: Optional[dict] = None
+        self._creds_stamp = None
+
         logger.warning("Using encrypted file storage (fallback)")
         logger.warning("For better security, install keyring support for your OS")
 
@@ -315,19 +395,39 @@ class EncryptedFileProvider(SecretProvider):
                 return f.read()
         else:
             # Generate new key
-            key = self.Fernet.generate_key()
+            key = Fernet.generate_key()
             with open(key_path, 'wb') as f:
                 f.write(key)
             # Set restrictive permissions (Unix only)
             try:
-                import os
                 os.chmod(key_path, 0o600)
             except:
                 pass
             return key
 
+    def _file_stamp(self):
+        """(mtime, size) of the credentials file, or None if it doesn't exist."""
+        try:
+            stat = self.storage_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
     def _load_credentials(self) -> dict:
-        """Load and decrypt credentials file."""
+        """
+        Load and decrypt credentials file.
+
+        The decrypted credentials are reused until the file changes, so
+        changes made by another provider instance or process are seen.
+        """
+        stamp = self._file_stamp()
+        if self._creds is None or stamp != self._creds_stamp:
+            self._creds = self._read_credentials()
+            self._creds_stamp = stamp
+        return self._creds
+
+    def _read_credentials(self) -> dict:
+        """Read and decrypt credentials file."""
         if not self.storage_path.exists():
             return {}
 
@@ -336,7 +436,7 @@ class EncryptedFileProvider(SecretProvider):
                 encrypted_data = f.read()
 
             decrypted_data = self.cipher.decrypt(encrypted_data)
-            return self.json.loads(decrypted_data.decode())
+            return json.loads(decrypted_data.decode())
         except Exception as e:
             logger.error(f"Error loading credentials: {e}")
             return {}
@@ -344,7 +444,7 @@ class EncryptedFileProvider(SecretProvider):
     def _save_credentials(self, credentials: dict):
         """Encrypt and save credentials file."""
         try:
-            json_data = self.json.dumps(credentials).encode()
+            json_data = json.dumps(credentials).encode()
             encrypted_data = self.cipher.encrypt(json_data)
 
             with open(self.storage_path, 'wb') as f:
@@ -352,7 +452,6 @@ class EncryptedFileProvider(SecretProvider):
 
             # Set restrictive permissions (Unix only)
             try:
-                import os
                 os.chmod(self.storage_path, 0o600)
             except:
                 pass
@@ -360,6 +459,12 @@ class EncryptedFileProvider(SecretProvider):
             logger.error(f"Error saving credentials: {e}")
             raise
 
+    def _update_credentials(self, credentials: dict):
+        """Save changed credentials and keep them as the in-memory copy."""
+        self._save_credentials(credentials)
+        self._creds = credentials
+        self._creds_stamp = self._file_stamp()
+
     def store_key(
         self,
         exchange_id: str,
@@ -378,7 +483,8 @@ class EncryptedFileProvider(SecretProvider):
         """
         logger.info(f"Storing credentials for {exchange_id} in encrypted file")
 
-        credentials = self._load_credentials()
+        # Re-read so changes made elsewhere since our last read aren't lost
+        credentials = dict(self._read_credentials())
         credentials[exchange_id] = {
             'api_key': api_key,
             'api_secret': api_secret
@@ -387,7 +493,7 @@ class EncryptedFileProvider(SecretProvider):
         if passphrase:
             credentials[exchange_id]['passphrase'] = passphrase
 
-        self._save_credentials(credentials)
+        self._update_credentials(credentials)
 
         logger.info(f"✓ Credentials stored for {exchange_id}")
 
@@ -418,11 +524,12 @@ class EncryptedFileProvider(SecretProvider):
         """Delete API credentials from encrypted file."""
         logger.info(f"Deleting credentials for {exchange_id}")
 
-        credentials = self._load_credentials()
+        # Re-read so changes made elsewhere since our last read aren't lost
+        credentials = dict(self._read_credentials())
 
         if exchange_id in credentials:
             del credentials[exchange_id]
-            self._save_credentials(credentials)
+            self._update_credentials(credentials)
             logger.info(f"✓ Credentials deleted for {exchange_id}")
         else:
             logger.warning(f"No credentials found to delete for {exchange_id}")
@@ -17,16 +17,20 @@ This prevents:
 - Security breaches from log analysis
 """
 
+import atexit
 import logging
+import queue
 import sys
 import re
-from typing import Optional, List, Pattern
+from typing import Optional, List, Pattern, Tuple
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from colorama import Fore, Style, init
 
-# Initialize colorama for Windows support
-init(autoreset=True)
+# Initialize colorama for Windows support. No autoreset: colored output resets
+# explicitly (see ColoredFormatter), and autoreset would wrap stdout on every
+# platform, adding a Python-level write layer to each log line.
+init()
 
 
 # Sensitive keys that should never be logged
@@ -42,30 +46,92 @@ SENSITIVE_KEYS = [
     'credential', 'credentials',
 ]
 
-# Patterns for detecting sensitive data in strings
+# Private keys (PEM format). The body length is bounded so BEGIN lines without
+# a matching END can't make the scan quadratic; 16 KB is well above the
+# largest RSA key encoding.
+PEM_PRIVATE_KEY_PATTERN: Pattern = re.compile(
+    r'(-----BEGIN (?:RSA |EC )?PRIVATE KEY-----).{0,16384}?-----END (?:RSA |EC )?PRIVATE KEY-----',
+    re.DOTALL
+)
+
+# Patterns for detecting sensitive data in strings.
+# Group 1 is the text kept before the redacted value.
 SENSITIVE_PATTERNS: List[Pattern] = [
     # API keys (long alphanumeric strings)
-    re.compile(r'["\']?(?:api[_-]?key|apikey)["\']?\s*[:=]\s*["\']?([A-Za-z0-9_\-]{20,})["\']?', re.IGNORECASE),
+    re.compile(r'(["\']?(?:api[_-]?key|apikey)["\']?\s*[:=]\s*["\']?)[A-Za-z0-9_\-]{20,}', re.IGNORECASE),
 
     # Secrets (long alphanumeric strings)
-    re.compile(r'["\']?(?:api[_-]?secret|apisecret|secret)["\']?\s*[:=]\s*["\']?([A-Za-z0-9_\-/+=]{20,})["\']?', re.IGNORECASE),
+    re.compile(r'(["\']?(?:api[_-]?secret|apisecret|secret)["\']?\s*[:=]\s*["\']?)[A-Za-z0-9_\-/+=]{20,}', re.IGNORECASE),
 
     # Tokens (JWT-like patterns)
-    re.compile(r'["\']?(?:token|access[_-]?token|auth[_-]?token)["\']?\s*[:=]\s*["\']?([A-Za-z0-9_\-\.]{20,})["\']?', re.IGNORECASE),
+    re.compile(r'(["\']?(?:token|access[_-]?token|auth[_-]?token)["\']?\s*[:=]\s*["\']?)[A-Za-z0-9_\-\.]{20,}', re.IGNORECASE),
 
     # Passwords
-    re.compile(r'["\']?(?:password|passwd|pwd)["\']?\s*[:=]\s*["\']?([^\s"\']{6,})["\']?', re.IGNORECASE),
+    re.compile(r'(["\']?(?:password|passwd|pwd)["\']?\s*[:=]\s*["\']?)[^\s"\']{6,}', re.IGNORECASE),
 
     # Private keys (PEM format)
-    re.compile(r'-----BEGIN (?:RSA |EC )?PRIVATE KEY-----.*?-----END (?:RSA |EC )?PRIVATE KEY-----', re.DOTALL),
+    PEM_PRIVATE_KEY_PATTERN,
 
     # Signatures (hex strings)
-    re.compile(r'["\']?signature["\']?\s*[:=]\s*["\']?([A-Fa-f0-9]{32,})["\']?', re.IGNORECASE),
+    re.compile(r'(["\']?signature["\']?\s*[:=]\s*["\']?)[A-Fa-f0-9]{32,}', re.IGNORECASE),
 
     # Authorization headers
-    re.compile(r'Authorization:\s*(?:Bearer|Basic)\s+([A-Za-z0-9_\-\.=/+]+)', re.IGNORECASE),
+    re.compile(r'(Authorization:\s*(?:Bearer|Basic)\s+)[A-Za-z0-9_\-\.=/+]+', re.IGNORECASE),
+]
+
+# The other SENSITIVE_PATTERNS, run one after another by Strategy 1. They stay
+# separate passes: in a single alternation an earlier match can swallow the
+# key of a later secret ("password = x;api-key = ...") and leave it unredacted.
+# PEM keys run first on their own, and only when a BEGIN line is present.
+_SENSITIVE_PASSES: List[Pattern] = [
+    pattern for pattern in SENSITIVE_PATTERNS
+    if pattern is not PEM_PRIVATE_KEY_PATTERN
+]
+
+# Key-value patterns for each SENSITIVE_KEYS entry, in the order they are
+# applied. Group 1 is the text before the value, group 2 the closing quote (if
+# any). Keys get separate passes: with all keys in one alternation, a value
+# matched for one key can swallow the next key and leave its secret in clear.
+_KEY_VALUE_PASSES: List[Tuple[str, List[Pattern]]] = [
+    (key, [
+        # JSON-style: "key": "value"
+        re.compile(rf'(["\']?{re.escape(key)}["\']?\s*:\s*["\'])[^"\']+(["\'])', re.IGNORECASE),
+        # Assignment style: key=value
+        re.compile(rf'({re.escape(key)}\s*=\s*["\']?)[^\s,\)}}]+(["\']?)', re.IGNORECASE),
+        # Dictionary style: 'key': 'value'
+        re.compile(rf"('{re.escape(key)}':\s*')[^']+(')", re.IGNORECASE),
+    ])
+    for key in SENSITIVE_KEYS
 ]
 
+KEY_VALUE_PATTERNS: List[Pattern] = [
+    pattern for _, patterns in _KEY_VALUE_PASSES for pattern in patterns
+]
+
+# Every redaction pattern needs one of these words (case-insensitive) to match,
+# so messages containing none of them can skip redaction entirely
+_REDACT_TRIGGERS = ('key', 'secret', 'token', 'pass', 'pwd', 'sign', 'auth', 'credential')
+
+# Same check for non-ASCII messages, where IGNORECASE also folds characters
+# such as 'ſ' and 'ı' that str.lower() leaves alone
+_REDACT_TRIGGER_PATTERN: Pattern = re.compile('|'.join(_REDACT_TRIGGERS), re.IGNORECASE)
+
+# Long alphanumeric strings that follow a secret-like keyword
+SECRET_CONTEXT_PATTERN: Pattern = re.compile(
+    r'((?:key|secret|token|password|auth|signature|credential)[\s:=]+)[A-Za-z0-9_\-/+=]{32,}',
+    re.IGNORECASE
+)
+
+
+def _redact_value(match) -> str:
+    """Replace the value after group 1 with a REDACTED marker."""
+    return match[1] + '****REDACTED****'
+
+
+def _mask_value(match) -> str:
+    """Replace the value between groups 1 and 2 with a mask."""
+    return match[1] + '****' + match[2]
+
 
 class SecureFilter(logging.Filter):
     """
@@ -73,6 +139,10 @@ class SecureFilter(logging.Filter):
 
     This filter is applied to ALL log records to ensure
     no sensitive data is ever written to logs.
+
+    It must be attached to every handler: filters on the root logger only
+    see records logged on the root logger itself, not records propagated
+    from module loggers.
     """
 
     def filter(self, record):
@@ -85,16 +155,24 @@ class SecureFilter(logging.Filter):
         Returns:
             True (always allow the record, but redact it first)
         """
-        # Redact message
-        if hasattr(record, 'msg'):
-            record.msg = redact_secrets(str(record.msg))
-
-        # Redact args (if any)
-        if hasattr(record, 'args') and record.args:
-            if isinstance(record.args, dict):
-                record.args = {k: redact_secrets(str(v)) for k, v in record.args.items()}
-            elif isinstance(record.args, (list, tuple)):
-                record.args = tuple(redact_secrets(str(arg)) for arg in record.args)
+        # A bare number has nothing to redact, and a record already redacted
+        # by another handler's filter doesn't need it again
+        if getattr(record, '_redacted', False) or (
+            not record.args and isinstance(record.msg, (int, float))
+        ):
+            return True
+
+        # Interpolate args once, then redact the final message. Filters run
+        # per handler, so this only happens for records that will be emitted.
+        try:
+            message = record.getMessage()
+        except Exception:
+            # Malformed format args: keep both, redacted, rather than raising here
+            message = f"{record.msg} {record.args}"
+
+        record.msg = redact_secrets(message)
+        record.args = None
+        record._redacted = True
 
         return True
 
@@ -103,6 +181,9 @@ def redact_secrets(message: str) -> str:
     """
     Redact sensitive information from a string.
 
+    Results are deliberately not cached: a cache would keep the unredacted
+    messages alive for the life of the process.
+
     This function uses multiple strategies:
     1. Pattern matching for common secret formats
     2. Key-value pair detection
@@ -117,38 +198,75 @@ def redact_secrets(message: str) -> str:
     if not message:
         return message
 
+    # Fast path: most log lines contain no secret-like keyword at all
+    if message.isascii():
+        lowered = message.lower()
+        for trigger in _REDACT_TRIGGERS:
+            if trigger in lowered:
+                break
+        else:
+            return message
+    elif not _REDACT_TRIGGER_PATTERN.search(message):
+        return message
+    else:
+        # IGNORECASE folding makes substring checks unreliable here
+        lowered = None
+
     # Strategy 1: Pattern-based redaction
-    for pattern in SENSITIVE_PATTERNS:
-        message = pattern.sub(lambda m: m.group(0).replace(m.group(1), '****REDACTED****'), message)
+    if '-----BEGIN' in message:
+        message = PEM_PRIVATE_KEY_PATTERN.sub(_redact_value, message)
+    for pattern in _SENSITIVE_PASSES:
+        message = pattern.sub(_redact_value, message)
 
     # Strategy 2: Key-value pair redaction
-    # Look for patterns like "api_key: value" or "api_key=value"
-    for key in SENSITIVE_KEYS:
-        # Match key followed by : or = and capture the value
-        patterns = [
-            # JSON-style: "key": "value"
-            re.compile(rf'["\']?{re.escape(key)}["\']?\s*:\s*["\']([^"\']+)["\']', re.IGNORECASE),
-            # Assignment style: key=value
-            re.compile(rf'{re.escape(key)}\s*=\s*["\']?([^\s,\)}}]+)["\']?', re.IGNORECASE),
-            # Dictionary style: 'key': 'value'
-            re.compile(rf"'{re.escape(key)}':\s*'([^']+)'", re.IGNORECASE),
-        ]
-
+    # Look for patterns like "api_key: value" or "api_key=value". Each style
+    # and Strategy 3 run as separate passes: combined into one alternation, a
+    # value matched by one style can swallow the key of the next secret.
+    # A key's patterns can only match if the key occurs in the message;
+    # redaction never adds one, so keys absent from the original are skipped
+    for key, patterns in _KEY_VALUE_PASSES:
+        if lowered is not None and key not in lowered:
+            continue
         for pattern in patterns:
-            message = pattern.sub(lambda m: m.group(0).replace(m.group(1), '****'), message)
+            message = pattern.sub(_mask_value, message)
 
     # Strategy 3: Detect and redact long alphanumeric strings that look like secrets
     # (Only if they appear after certain keywords)
-    secret_context_pattern = re.compile(
-        r'(?:key|secret|token|password|auth|signature|credential)[\s:=]+([A-Za-z0-9_\-/+=]{32,})',
-        re.IGNORECASE
-    )
-    message = secret_context_pattern.sub(lambda m: m.group(0).replace(m.group(1), '****REDACTED****'), message)
+    message = SECRET_CONTEXT_PATTERN.sub(_redact_value, message)
 
     return message
 
 
-class ColoredFormatter(logging.Formatter):
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that formats asctime at most once per second.
+
+    With a datefmt (which has no milliseconds), records logged within the
+    same second reuse the previous time string instead of calling
+    localtime() and strftime() again.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # (second, formatted time) for the last record
+        self._time_cache = (None, '')
+
+    def formatTime(self, record, datefmt=None):
+        """Format record time, reusing the string within the same second."""
+        if datefmt is None:
+            # Default format includes milliseconds, so it can't be cached
+            return super().formatTime(record, datefmt)
+
+        second = int(record.created)
+        cached_second, cached_time = self._time_cache
+        if second != cached_second:
+            cached_time = super().formatTime(record, datefmt)
+            self._time_cache = (second, cached_time)
+        return cached_time
+
+
+class ColoredFormatter(CachedTimeFormatter):
     """
     Custom formatter with colors and secret redaction.
 
@@ -164,16 +282,64 @@ class ColoredFormatter(logging.Formatter):
         'CRITICAL': Fore.RED + Style.BRIGHT,
     }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Colored level names, built once instead of per record
+        self._colored_levels = {
+            level: f"{color}{level}{Style.RESET_ALL}"
+            for level, color in self.COLORS.items()
+        }
+
     def format(self, record):
-        # Add color to level name
+        # Add color to level name, restoring it afterwards because the same
+        # record is passed to the other handlers (e.g. the log file)
         levelname = record.levelname
-        if levelname in self.COLORS:
-            record.levelname = f"{self.COLORS[levelname]}{levelname}{Style.RESET_ALL}"
+        record.levelname = self._colored_levels.get(levelname, levelname)
 
         # Note: Redaction is handled by SecureFilter, not here
         # This ensures redaction happens before any formatting
 
-        return super().format(record)
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = levelname
+
+
+# Background thread that writes log files, so file I/O and rotation don't
+# block the calling thread. Started by setup_logger().
+_file_listener: Optional[QueueListener] = None
+
+
+# Prefix for names of handlers added by this module
+_HANDLER_PREFIX = 'kryptomf.'
+
+# (verbose, log file) of the current setup_logger() configuration
+_logger_config: Optional[tuple] = None
+
+
+def _stop_file_listener():
+    """Flush queued records to the log files and stop the writer thread."""
+    global _file_listener
+    if _file_listener is not None:
+        _file_listener.stop()
+        for handler in _file_listener.handlers:
+            handler.close()
+        _file_listener = None
+
+
+def _remove_handlers(logger: logging.Logger):
+    """Remove and close the handlers this module added to a logger."""
+    _stop_file_listener()
+    for handler in list(logger.handlers):
+        if handler.name and handler.name.startswith(_HANDLER_PREFIX):
+            logger.removeHandler(handler)
+            handler.close()
+
+
+# Runs before logging's own shutdown hook (atexit is LIFO), so queued records
+# are written before the file handlers are closed
+atexit.register(_stop_file_listener)
 
 
 def setup_logger(verbose: bool = False, log_file: Optional[str] = None) -> logging.Logger:
@@ -187,17 +353,35 @@ def setup_logger(verbose: bool = False, log_file: Optional[str] = None) -> loggi
     Returns:
         Configured logger
     """
+    global _file_listener, _logger_config
+
     logger = logging.getLogger()
     logger.setLevel(logging.DEBUG if verbose else logging.INFO)
 
-    # Remove existing handlers
-    logger.handlers.clear()
+    # Resolve the log file (without colors, with rotation)
+    if log_file is None:
+        # Default log directory
+        log_dir = Path(__file__).parent.parent.parent / 'logs'
+        log_dir.mkdir(exist_ok=True)
+        log_file = log_dir / 'bot.log'
+    else:
+        log_file = Path(log_file)
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+
+    # Already set up the same way: keep the existing handlers and open file
+    config = (verbose, str(log_file.resolve()))
+    if config == _logger_config and _file_listener is not None:
+        return logger
+
+    # Remove handlers from a previous setup (leaving any added by others)
+    _remove_handlers(logger)
 
     # Add secure filter to prevent credential leakage
     secure_filter = SecureFilter()
 
     # Console handler (with colors)
     console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.set_name(f"{_HANDLER_PREFIX}console")
     console_handler.setLevel(logging.DEBUG if verbose else logging.INFO)
     console_handler.addFilter(secure_filter)
 
@@ -209,16 +393,6 @@ def setup_logger(verbose: bool = False, log_file: Optional[str] = None) -> loggi
     console_handler.setFormatter(console_formatter)
     logger.addHandler(console_handler)
 
-    # File handler (without colors, with rotation)
-    if log_file is None:
-        # Default log directory
-        log_dir = Path(__file__).parent.parent.parent / 'logs'
-        log_dir.mkdir(exist_ok=True)
-        log_file = log_dir / 'bot.log'
-    else:
-        log_file = Path(log_file)
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-
     # Rotating file handler: 10MB max, keep 10 backup files
     file_handler = RotatingFileHandler(
         log_file,
@@ -226,16 +400,28 @@ def setup_logger(verbose: bool = False, log_file: Optional[str] = None) -> loggi
         backupCount=10,
         encoding='utf-8'
     )
+    file_handler.set_name(f"{_HANDLER_PREFIX}file")
     file_handler.setLevel(logging.DEBUG)  # Always log DEBUG to file
     file_handler.addFilter(secure_filter)
 
     # Plain formatter for file (no colors)
-    file_formatter = logging.Formatter(
+    file_formatter = CachedTimeFormatter(
         fmt='[%(asctime)s] %(levelname)s - %(name)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+
+    # Records reach the file handler through a queue. Redaction runs on the
+    # queue handler, before records cross to the writer thread.
+    file_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(file_queue)
+    queue_handler.set_name(f"{_HANDLER_PREFIX}file_queue")
+    queue_handler.addFilter(secure_filter)
+    logger.addHandler(queue_handler)
+
+    _file_listener = QueueListener(file_queue, file_handler, respect_handler_level=True)
+    _file_listener.start()
+    _logger_config = config
 
     logger.info(f"Logging to file: {log_file}")
 
@@ -271,6 +457,8 @@ def setup_session_logger(mode: str, symbol: str = None, strategy: str = None) ->
     """
     from datetime import datetime
 
+    global _file_listener
+
     # Create logs directory
     log_dir = Path(__file__).parent.parent.parent / 'logs'
     log_dir.mkdir(exist_ok=True)
@@ -302,16 +490,31 @@ def setup_session_logger(mode: str, symbol: str = None, strategy: str = None) ->
         backupCount=5,
         encoding='utf-8'
     )
+    session_handler.set_name(f"{_HANDLER_PREFIX}session")
     session_handler.setLevel(logging.DEBUG)
     session_handler.addFilter(SecureFilter())
 
     # Plain formatter for file
-    session_formatter = logging.Formatter(
+    session_formatter = CachedTimeFormatter(
         fmt='[%(asctime)s] %(levelname)s - %(name)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     session_handler.setFormatter(session_formatter)
-    logger.addHandler(session_handler)
+
+    if _file_listener is not None:
+        # Write on the background thread along with the main log file. A
+        # running listener's handlers can't be changed, so stop it (writing
+        # what is already queued) and start one with the session handler added.
+        _file_listener.stop()
+        _file_listener = QueueListener(
+            _file_listener.queue,
+            *_file_listener.handlers,
+            session_handler,
+            respect_handler_level=True
+        )
+        _file_listener.start()
+    else:
+        logger.addHandler(session_handler)
 
     logger.info(f"Session log created: {log_file}")
 
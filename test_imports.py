@@ -9,6 +9,7 @@ Usage:
     python test_imports.py
 """
 
+import importlib
 import sys
 from pathlib import Path
 
@@ -22,65 +23,66 @@ print("Testing KryptoMF Bot Core Imports")
 print("=" * 70)
 print()
 
+# Imports to check, grouped by section: (module, attribute, ...)
+IMPORT_GROUPS = [
+    ("Core Modules", [
+        ("core.bot_instance", "BotInstance"),
+        ("core.config_manager", "ConfigManager"),
+    ]),
+    ("CLI Modules", [
+        ("cli.status_display", "StatusDisplay"),
+        ("cli.bot_controller", "run_interactive_mode"),
+    ]),
+    ("Backtesting Modules", [
+        ("backtesting.backtest_engine", "BacktestEngine"),
+        ("backtesting.backtest_results", "BacktestResults"),
+        ("backtesting.historical_data", "HistoricalDataFetcher"),
+    ]),
+    ("Plugin Modules", [
+        ("plugins.indicators", "TechnicalIndicators"),
+        ("plugins.exchanges.ccxt_exchange", "CCXTExchange"),
+        ("plugins.strategies.grid_trading", "GridTradingStrategy"),
+        ("plugins.strategies.dca", "DCAStrategy"),
+    ]),
+    ("Security Modules", [
+        ("security.secret_provider", "get_secret_provider"),
+        ("security.order_signing", "OrderSigner"),
+    ]),
+    ("Utility Modules", [
+        ("utils.logger", "setup_logger", "get_logger"),
+    ]),
+    ("Base Plugin Classes", [
+        ("plugins.base.exchange_plugin", "ExchangePlugin"),
+        ("plugins.base.strategy_plugin", "StrategyPlugin"),
+    ]),
+]
+
 # Track results
 passed = []
 failed = []
 
-def test_import(module_name, import_statement):
-    """Test a single import statement."""
+def test_import(module_path, *attrs):
+    """Import a module and look up its attributes. Returns an error or None."""
     try:
-        exec(import_statement)
-        passed.append(module_name)
-        print(f"✓ {module_name}")
-        return True
+        module = importlib.import_module(module_path)
+        for attr in attrs:
+            getattr(module, attr)
+        return None
     except Exception as e:
-        failed.append((module_name, str(e)))
-        print(f"✗ {module_name}: {e}")
-        return False
-
-print("Testing Core Modules:")
-print("-" * 70)
-test_import("core.bot_instance", "from core.bot_instance import BotInstance")
-test_import("core.config_manager", "from core.config_manager import ConfigManager")
-print()
-
-print("Testing CLI Modules:")
-print("-" * 70)
-test_import("cli.status_display", "from cli.status_display import StatusDisplay")
-test_import("cli.bot_controller", "from cli.bot_controller import run_interactive_mode")
-print()
-
-print("Testing Backtesting Modules:")
-print("-" * 70)
-test_import("backtesting.backtest_engine", "from backtesting.backtest_engine import BacktestEngine")
-test_import("backtesting.backtest_results", "from backtesting.backtest_results import BacktestResults")
-test_import("backtesting.historical_data", "from backtesting.historical_data import HistoricalDataFetcher")
-print()
-
-print("Testing Plugin Modules:")
-print("-" * 70)
-test_import("plugins.indicators", "from plugins.indicators import TechnicalIndicators")
-test_import("plugins.exchanges.ccxt_exchange", "from plugins.exchanges.ccxt_exchange import CCXTExchange")
-test_import("plugins.strategies.grid_trading", "from plugins.strategies.grid_trading import GridTradingStrategy")
-test_import("plugins.strategies.dca", "from plugins.strategies.dca import DCAStrategy")
-print()
-
-print("Testing Security Modules:")
-print("-" * 70)
-test_import("security.secret_provider", "from security.secret_provider import get_secret_provider")
-test_import("security.order_signing", "from security.order_signing import OrderSigner")
-print()
-
-print("Testing Utility Modules:")
-print("-" * 70)
-test_import("utils.logger", "from utils.logger import setup_logger, get_logger")
-print()
+        return str(e)
 
-print("Testing Base Plugin Classes:")
-print("-" * 70)
-test_import("plugins.base.exchange_plugin", "from plugins.base.exchange_plugin import ExchangePlugin")
-test_import("plugins.base.strategy_plugin", "from plugins.base.strategy_plugin import StrategyPlugin")
-print()
+for group, items in IMPORT_GROUPS:
+    print(f"Testing {group}:")
+    print("-" * 70)
+    for module_path, *attrs in items:
+        error = test_import(module_path, *attrs)
+        if error is None:
+            passed.append(module_path)
+            print(f"✓ {module_path}")
+        else:
+            failed.append((module_path, error))
+            print(f"✗ {module_path}: {error}")
+    print()
 
 # Summary
 print("=" * 70)
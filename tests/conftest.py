@@ -7,17 +7,27 @@ Shared fixtures for all tests.
 import pytest
 import sys
 from pathlib import Path
+from types import MappingProxyType
 from unittest.mock import Mock, MagicMock
 
 # Add src to path
 src_path = Path(__file__).parent.parent / 'src'
 sys.path.insert(0, str(src_path))
 
+# Import the modules tests patch up front, so collection loads them once
+import core.bot_instance
+import plugins.exchanges.ccxt_exchange
+import plugins.strategies.dca
 
-@pytest.fixture
+from core.bot_instance import BotInstance
+from plugins.base.exchange_plugin import ExchangePlugin
+from security.secret_provider import SecretProvider
+
+
+@pytest.fixture(scope="module")
 def mock_exchange():
-    """Mock exchange connector."""
-    exchange = Mock()
+    """Mock exchange connector (shared by the tests in a module)."""
+    exchange = MagicMock(spec=ExchangePlugin)
     exchange.exchange_id = 'binance_us'
     exchange.paper_trading = True
     exchange.get_balance.return_value = {'USD': 10000.0, 'BTC': 0.0}
@@ -44,71 +54,139 @@ def mock_exchange():
     return exchange
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def mock_bot():
+    """Mock bot instance for strategies that only keep a reference to it."""
+    return Mock(spec=BotInstance)
+
+
+@pytest.fixture(scope="module")
 def mock_secret_provider():
-    """Mock secret provider."""
-    provider = Mock()
-    provider.get_key.return_value = ('test_api_key', 'test_api_secret')
+    """Mock secret provider (shared by the tests in a module)."""
+    provider = MagicMock(spec=SecretProvider)
+    provider.get_key.return_value = ('test_api_key', 'test_api_secret', None)
     provider.store_key.return_value = None
     return provider
 
 
-@pytest.fixture
-def bot_config():
-    """Sample bot configuration."""
+def pytest_addoption(parser):
+    parser.addoption(
+        '--run-benchmarks', action='store_true', default=False,
+        help='run tests marked benchmark (skipped by default)'
+    )
+
+
+def pytest_configure(config):
+    # Registered here too so the marker is known when pytest-xdist isn't installed
+    config.addinivalue_line(
+        'markers', 'xdist_group(name): run all tests in the group on the same xdist worker'
+    )
+    config.addinivalue_line(
+        'markers', 'benchmark: timing test, only run with --run-benchmarks'
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--run-benchmarks'):
+        return
+    
+    skip_benchmark = pytest.mark.skip(reason='benchmark; use --run-benchmarks to run')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+# Sample configuration and market data. Read-only so a test can't change
+# what the next one sees; fixtures that tests modify hand out copies.
+BOT_CONFIG = MappingProxyType({
+    'name': 'Test Bot',
+    'exchange': 'binance_us',
+    'symbol': 'BTC/USD',
+    'strategy': 'grid_trading',
+    'strategy_params': MappingProxyType({
+        'grid_spacing': 2.5,
+        'grid_levels': 10,
+        'position_size': 100
+    }),
+    'paper_trading': True,
+    'check_interval': 1  # 1 second for faster tests
+})
+
+GRID_STRATEGY_CONFIG = MappingProxyType({
+    'name': 'grid_trading',
+    'params': MappingProxyType({
+        'grid_spacing': 2.5,
+        'grid_levels': 10,
+        'position_size': 100
+    })
+})
+
+DCA_STRATEGY_CONFIG = MappingProxyType({
+    'name': 'dca',
+    'params': MappingProxyType({
+        'min_interval_hours': 24,
+        'amount_usd': 100,
+        'max_price': 70000,
+        'min_price': 60000,
+        # EMA only, so the buy decision depends on the sample candles alone
+        'indicators': MappingProxyType({
+            'rsi': MappingProxyType({'enabled': False}),
+            'rising_price': MappingProxyType({'enabled': False})
+        })
+    })
+})
+
+MARKET_DATA = MappingProxyType({
+    'symbol': 'BTC/USD',
+    'last': 67450.0,
+    'bid': 67449.0,
+    'ask': 67451.0,
+    'high': 68000.0,
+    'low': 66000.0,
+    'volume': 1000.0,
+    'timestamp': 1234567890
+})
+
+
+def _thaw(mapping):
+    """Return a modifiable deep copy of a read-only sample mapping."""
     return {
-        'name': 'Test Bot',
-        'exchange': 'binance_us',
-        'symbol': 'BTC/USD',
-        'strategy': 'grid_trading',
-        'strategy_params': {
-            'grid_spacing': 2.5,
-            'grid_levels': 10,
-            'position_size': 100
-        },
-        'paper_trading': True,
-        'check_interval': 1  # 1 second for faster tests
+        key: _thaw(value) if isinstance(value, MappingProxyType) else value
+        for key, value in mapping.items()
     }
 
 
+@pytest.fixture(scope="session")
+def _bot_config_base():
+    """Sample bot configuration (shared, read-only)."""
+    return BOT_CONFIG
+
+
 @pytest.fixture
+def bot_config(_bot_config_base):
+    """Sample bot configuration (a fresh, modifiable copy per test)."""
+    return _thaw(_bot_config_base)
+
+
+@pytest.fixture(scope="session")
 def grid_strategy_config():
     """Grid trading strategy configuration."""
-    return {
-        'name': 'grid_trading',
-        'params': {
-            'grid_spacing': 2.5,
-            'grid_levels': 10,
-            'position_size': 100
-        }
-    }
+    return GRID_STRATEGY_CONFIG
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dca_strategy_config():
     """DCA strategy configuration."""
-    return {
-        'name': 'dca',
-        'params': {
-            'interval_hours': 24,
-            'amount_usd': 100,
-            'max_price': 70000,
-            'min_price': 60000
-        }
-    }
+    return DCA_STRATEGY_CONFIG
 
 
-@pytest.fixture
-def market_data():
-    """Sample market data."""
-    return {
-        'symbol': 'BTC/USD',
-        'last': 67450.0,
-        'bid': 67449.0,
-        'ask': 67451.0,
-        'high': 68000.0,
-        'low': 66000.0,
-        'volume': 1000.0,
-        'timestamp': 1234567890
-    }
+@pytest.fixture(scope="session")
+def _market_data_base():
+    """Sample market data (shared, read-only)."""
+    return MARKET_DATA
+
 
+@pytest.fixture
+def market_data(_market_data_base):
+    """Sample market data (a fresh, modifiable copy per test)."""
+    return _thaw(_market_data_base)
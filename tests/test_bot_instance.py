@@ -5,17 +5,78 @@ Tests the core bot instance functionality.
 """
 
 import pytest
-import time
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import Mock, MagicMock
+from core import bot_instance as bot_instance_module
 from core.bot_instance import BotInstance
 
 
+@pytest.fixture(scope="module")
+def bot_deps():
+    """Replace BotInstance's exchange, strategy lookup and secret provider with mocks."""
+    deps = SimpleNamespace(
+        exchange=MagicMock(),
+        strategy=MagicMock(),
+        # Only handed on to the (mocked) exchange, never called
+        secret_provider=SimpleNamespace(),
+    )
+    deps.get_strategy_class = MagicMock(return_value=deps.strategy)
+    
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(bot_instance_module, 'CCXTExchange', deps.exchange)
+        mp.setattr(bot_instance_module, 'get_strategy_class', deps.get_strategy_class)
+        mp.setattr(bot_instance_module, 'get_secret_provider', lambda: deps.secret_provider)
+        yield deps
+
+
+@pytest.fixture(autouse=True)
+def fresh_bot_deps(bot_deps, monkeypatch, tmp_path):
+    """Clear the dependency mocks' call records for each test."""
+    # Bots save state under ./data by default; keep that out of the working tree
+    monkeypatch.chdir(tmp_path)
+    
+    bot_deps.exchange.reset_mock()
+    bot_deps.strategy.reset_mock()
+    bot_deps.get_strategy_class.reset_mock()
+    return bot_deps
+
+
+@pytest.fixture
+def mock_thread(monkeypatch):
+    """Mock Thread class for BotInstance.start(); started threads report alive."""
+    thread_class = MagicMock()
+    thread_class.return_value.is_alive.return_value = True
+    monkeypatch.setattr(bot_instance_module, 'threading', SimpleNamespace(Thread=thread_class))
+    return thread_class
+
+
+@pytest.fixture(scope="class")
+def initialized_bot(_bot_config_base, bot_deps, tmp_path_factory):
+    """Initialized BotInstance using the mocked dependencies, shared by a test class."""
+    # Keep state files written after orders out of the working tree
+    config = {**_bot_config_base, 'state_dir': str(tmp_path_factory.mktemp('bot_state'))}
+    
+    bot = BotInstance(config)
+    bot.initialize()
+    
+    return bot, bot_deps
+
+
+@pytest.fixture
+def order_bot(initialized_bot):
+    """Shared initialized bot with trade stats reset for this test."""
+    bot, mocks = initialized_bot
+    bot.stats['total_trades'] = 0
+    return bot, mocks.exchange.return_value
+
+
+@pytest.mark.xdist_group("bot_instance")
 class TestBotInstance:
     """Test BotInstance class."""
     
-    def test_bot_creation(self, bot_config):
+    def test_bot_creation(self, _bot_config_base):
         """Test bot instance creation."""
-        bot = BotInstance(bot_config)
+        bot = BotInstance(_bot_config_base)
         
         assert bot.name == 'Test Bot'
         assert bot.exchange_id == 'binance_us'
@@ -25,29 +86,22 @@ class TestBotInstance:
         assert bot.running is False
         assert bot.paused is False
     
-    def test_bot_id_generation(self, bot_config):
+    def test_bot_id_generation(self, _bot_config_base):
         """Test bot ID is generated if not provided."""
-        bot = BotInstance(bot_config)
+        bot = BotInstance(_bot_config_base)
         assert bot.bot_id is not None
         assert len(bot.bot_id) == 36  # UUID length
     
-    def test_bot_id_custom(self, bot_config):
+    def test_bot_id_custom(self, _bot_config_base):
         """Test custom bot ID."""
         custom_id = 'my-custom-bot-id'
-        bot = BotInstance(bot_config, bot_id=custom_id)
+        bot = BotInstance(_bot_config_base, bot_id=custom_id)
         assert bot.bot_id == custom_id
     
-    @patch('core.bot_instance.CCXTExchange')
-    @patch('core.bot_instance.GridTradingStrategy')
-    @patch('core.bot_instance.get_secret_provider')
-    def test_bot_initialization(self, mock_secret, mock_strategy, mock_exchange, bot_config):
+    def test_bot_initialization(self, bot_deps, bot_config):
         """Test bot initialization."""
-        # Setup mocks
-        mock_secret.return_value = Mock()
-        mock_exchange_instance = Mock()
-        mock_exchange.return_value = mock_exchange_instance
-        mock_strategy_instance = Mock()
-        mock_strategy.return_value = mock_strategy_instance
+        mock_exchange_instance = bot_deps.exchange.return_value
+        mock_strategy_instance = bot_deps.strategy.return_value
         
         # Create and initialize bot
         bot = BotInstance(bot_config)
@@ -59,18 +113,10 @@ class TestBotInstance:
         mock_exchange_instance.connect.assert_called_once()
         mock_strategy_instance.initialize.assert_called_once_with(bot)
     
-    @patch('core.bot_instance.CCXTExchange')
-    @patch('core.bot_instance.GridTradingStrategy')
-    @patch('core.bot_instance.get_secret_provider')
-    def test_bot_start_stop(self, mock_secret, mock_strategy, mock_exchange, bot_config):
+    def test_bot_start_stop(self, bot_deps, mock_thread, bot_config):
         """Test bot start and stop."""
-        # Setup mocks
-        mock_secret.return_value = Mock()
-        mock_exchange_instance = Mock()
-        mock_exchange.return_value = mock_exchange_instance
-        mock_strategy_instance = Mock()
-        mock_strategy.return_value = mock_strategy_instance
-        mock_strategy_instance.get_state.return_value = {}
+        mock_exchange_instance = bot_deps.exchange.return_value
+        bot_deps.strategy.return_value.get_state.return_value = {}
         
         # Create and initialize bot
         bot = BotInstance(bot_config)
@@ -79,31 +125,23 @@ class TestBotInstance:
         # Start bot
         bot.start()
         assert bot.running is True
-        assert bot.thread is not None
-        assert bot.thread.is_alive()
+        assert bot.thread is mock_thread.return_value
+        mock_thread.assert_called_once_with(target=bot._run_loop, daemon=True)
+        mock_thread.return_value.start.assert_called_once()
         
         # Stop bot
-        time.sleep(0.1)  # Let it run briefly
         bot.stop()
         assert bot.running is False
+        mock_thread.return_value.join.assert_called_once()
         mock_exchange_instance.disconnect.assert_called_once()
     
-    @patch('core.bot_instance.CCXTExchange')
-    @patch('core.bot_instance.GridTradingStrategy')
-    @patch('core.bot_instance.get_secret_provider')
-    def test_bot_pause_resume(self, mock_secret, mock_strategy, mock_exchange, bot_config):
+    def test_bot_pause_resume(self, bot_deps, mock_thread, bot_config):
         """Test bot pause and resume."""
-        # Setup mocks
-        mock_secret.return_value = Mock()
-        mock_exchange_instance = Mock()
-        mock_exchange.return_value = mock_exchange_instance
-        mock_strategy_instance = Mock()
-        mock_strategy.return_value = mock_strategy_instance
-        
         # Create and initialize bot
         bot = BotInstance(bot_config)
         bot.initialize()
         bot.start()
+        mock_thread.return_value.start.assert_called_once()
         
         # Pause bot
         bot.pause()
@@ -117,22 +155,12 @@ class TestBotInstance:
         # Cleanup
         bot.stop()
     
-    @patch('core.bot_instance.CCXTExchange')
-    @patch('core.bot_instance.GridTradingStrategy')
-    @patch('core.bot_instance.get_secret_provider')
-    def test_bot_callbacks(self, mock_secret, mock_strategy, mock_exchange, bot_config):
+    def test_bot_callbacks(self, bot_deps, mock_thread, bot_config):
         """Test bot callbacks."""
-        # Setup mocks
-        mock_secret.return_value = Mock()
-        mock_exchange_instance = Mock()
-        mock_exchange.return_value = mock_exchange_instance
-        mock_strategy_instance = Mock()
-        mock_strategy.return_value = mock_strategy_instance
-        
-        # Create callbacks
+        # Create callbacks (only the status callback is checked)
         status_callback = Mock()
-        trade_callback = Mock()
-        error_callback = Mock()
+        trade_callback = lambda bot_id, order: None
+        error_callback = lambda bot_id, error: None
         
         # Create bot with callbacks
         bot = BotInstance(bot_config)
@@ -149,118 +177,67 @@ class TestBotInstance:
         # Cleanup
         bot.stop()
     
-    def test_bot_get_status(self, bot_config):
+    def test_bot_get_status(self, initialized_bot):
         """Test get_status method."""
-        bot = BotInstance(bot_config)
+        bot, _ = initialized_bot
         status = bot.get_status()
         
-        assert status['bot_id'] == bot.bot_id
-        assert status['name'] == 'Test Bot'
-        assert status['exchange'] == 'binance_us'
-        assert status['symbol'] == 'BTC/USD'
-        assert status['strategy'] == 'grid_trading'
-        assert status['running'] is False
-        assert status['paused'] is False
-        assert status['paper_trading'] is True
-        assert 'stats' in status
-        assert 'created_at' in status
+        expected = {
+            'bot_id': bot.bot_id,
+            'name': 'Test Bot',
+            'exchange': 'binance_us',
+            'symbol': 'BTC/USD',
+            'strategy': 'grid_trading',
+            'running': False,
+            'paused': False,
+            'paper_trading': True
+        }
+        assert expected.items() <= status.items()
+        assert {'stats', 'created_at'} <= status.keys()
     
-    @patch('core.bot_instance.CCXTExchange')
-    @patch('core.bot_instance.GridTradingStrategy')
-    @patch('core.bot_instance.get_secret_provider')
-    def test_execute_buy(self, mock_secret, mock_strategy, mock_exchange, bot_config):
-        """Test buy order execution."""
-        # Setup mocks
-        mock_secret.return_value = Mock()
-        mock_exchange_instance = Mock()
-        mock_exchange.return_value = mock_exchange_instance
+    @pytest.mark.parametrize('side,price,order_id', [
+        ('buy', 67450.0, 'test_order_123'),
+        ('sell', 68000.0, 'test_order_456'),
+    ])
+    def test_execute_order(self, order_bot, side, price, order_id):
+        """Test buy and sell order execution."""
+        bot, mock_exchange_instance = order_bot
         mock_exchange_instance.place_order.return_value = {
-            'id': 'test_order_123',
+            'id': order_id,
             'symbol': 'BTC/USD',
-            'side': 'buy',
+            'side': side,
             'amount': 0.01,
-            'price': 67450.0,
+            'price': price,
             'status': 'closed'
         }
-        mock_strategy_instance = Mock()
-        mock_strategy.return_value = mock_strategy_instance
-        
-        # Create bot
-        bot = BotInstance(bot_config)
-        bot.initialize()
         
-        # Execute buy
+        # Execute order
         signal = {
-            'action': 'buy',
+            'action': side,
             'metadata': {
-                'price': 67450.0,
+                'price': price,
                 'amount': 0.01
             }
         }
-        bot._execute_buy(signal)
+        getattr(bot, f'_execute_{side}')(signal)
         
         # Verify order was placed
-        mock_exchange_instance.place_order.assert_called_once_with(
-            symbol='BTC/USD',
-            side='buy',
-            amount=0.01,
-            price=67450.0,
-            order_type='limit'
-        )
-        
-        # Verify stats updated
-        assert bot.stats['total_trades'] == 1
-    
-    @patch('core.bot_instance.CCXTExchange')
-    @patch('core.bot_instance.GridTradingStrategy')
-    @patch('core.bot_instance.get_secret_provider')
-    def test_execute_sell(self, mock_secret, mock_strategy, mock_exchange, bot_config):
-        """Test sell order execution."""
-        # Setup mocks
-        mock_secret.return_value = Mock()
-        mock_exchange_instance = Mock()
-        mock_exchange.return_value = mock_exchange_instance
-        mock_exchange_instance.place_order.return_value = {
-            'id': 'test_order_456',
+        expected_kwargs = {
             'symbol': 'BTC/USD',
-            'side': 'sell',
+            'side': side,
             'amount': 0.01,
-            'price': 68000.0,
-            'status': 'closed'
-        }
-        mock_strategy_instance = Mock()
-        mock_strategy.return_value = mock_strategy_instance
-        
-        # Create bot
-        bot = BotInstance(bot_config)
-        bot.initialize()
-        
-        # Execute sell
-        signal = {
-            'action': 'sell',
-            'metadata': {
-                'price': 68000.0,
-                'amount': 0.01
-            }
+            'price': price,
+            'order_type': 'limit'
         }
-        bot._execute_sell(signal)
-        
-        # Verify order was placed
-        mock_exchange_instance.place_order.assert_called_once_with(
-            symbol='BTC/USD',
-            side='sell',
-            amount=0.01,
-            price=68000.0,
-            order_type='limit'
-        )
+        place_order = mock_exchange_instance.place_order
+        assert place_order.call_count == 1
+        assert place_order.call_args.args == ()
+        assert place_order.call_args.kwargs == expected_kwargs
         
         # Verify stats updated
         assert bot.stats['total_trades'] == 1
     
-    @patch('core.bot_instance.CCXTExchange')
-    @patch('core.bot_instance.DCAStrategy')
-    @patch('core.bot_instance.get_secret_provider')
-    def test_dca_strategy_initialization(self, mock_secret, mock_strategy, mock_exchange, bot_config):
+    def test_dca_strategy_initialization(self, bot_deps, bot_config):
         """Test DCA strategy initialization."""
         # Modify config for DCA
         bot_config['strategy'] = 'dca'
@@ -269,18 +246,11 @@ class TestBotInstance:
             'amount_usd': 100
         }
         
-        # Setup mocks
-        mock_secret.return_value = Mock()
-        mock_exchange_instance = Mock()
-        mock_exchange.return_value = mock_exchange_instance
-        mock_strategy_instance = Mock()
-        mock_strategy.return_value = mock_strategy_instance
-        
         # Create and initialize bot
         bot = BotInstance(bot_config)
         result = bot.initialize()
         
         assert result is True
-        mock_strategy.assert_called_once()
-        mock_strategy_instance.initialize.assert_called_once_with(bot)
-
+        bot_deps.get_strategy_class.assert_called_once_with('dca')
+        bot_deps.strategy.assert_called_once()
+        bot_deps.strategy.return_value.initialize.assert_called_once_with(bot)
@@ -4,12 +4,65 @@ Tests for DCA Strategy
 Tests the Dollar Cost Averaging strategy implementation.
 """
 
+import pandas as pd
 import pytest
-import time
-from unittest.mock import Mock
+from types import SimpleNamespace
+from plugins.strategies import dca as dca_module
 from plugins.strategies.dca import DCAStrategy
+from plugins.indicators import TechnicalIndicators
 
 
+# Filled buys at 60k/65k/70k for the average price test (average 65k)
+AVERAGING_ORDERS = (
+    {'id': 'test', 'side': 'buy', 'price': 60000.0, 'amount': 0.01, 'filled': 0.01, 'cost': 600.0},
+    {'id': 'test', 'side': 'buy', 'price': 65000.0, 'amount': 0.01, 'filled': 0.01, 'cost': 650.0},
+    {'id': 'test', 'side': 'buy', 'price': 70000.0, 'amount': 0.01, 'filled': 0.01, 'cost': 700.0},
+)
+
+# 60 hourly candles drifting down to the sample price, so the close sits below EMA-25
+OHLCV = pd.DataFrame({
+    'open': [68050.0 - 10 * i for i in range(60)],
+    'high': [68100.0 - 10 * i for i in range(60)],
+    'low': [67950.0 - 10 * i for i in range(60)],
+    'close': [68040.0 - 10 * i for i in range(60)],
+    'volume': [1000.0] * 60,
+})
+
+
+def _sell_price(strategy, buy_price):
+    """Fee-adjusted sell target computed directly from the strategy's settings."""
+    return TechnicalIndicators.calculate_sell_price_with_fees(
+        buy_price=buy_price,
+        buy_fee_percent=strategy.maker_fee,
+        sell_fee_percent=strategy.taker_fee,
+        profit_target_percent=strategy.profit_target
+    )
+
+
+@pytest.fixture
+def dca_market_data(market_data):
+    """Sample market data with enough OHLCV history for the indicators."""
+    market_data['ohlcv'] = OHLCV
+    return market_data
+
+
+@pytest.fixture
+def frozen_time(monkeypatch):
+    """Fix the DCA strategy's clock at a single instant and return it."""
+    now = 1_700_000_000.0
+    monkeypatch.setattr(dca_module, 'time', SimpleNamespace(time=lambda: now))
+    return now
+
+
+@pytest.fixture(scope="class")
+def dca_strategy(dca_strategy_config, mock_bot):
+    """Initialized DCAStrategy shared by a test class; tests reset the state they use."""
+    strategy = DCAStrategy(dca_strategy_config)
+    strategy.initialize(mock_bot)
+    return strategy
+
+
+@pytest.mark.xdist_group("dca")
 class TestDCAStrategy:
     """Test DCAStrategy class."""
     
@@ -18,7 +71,7 @@ class TestDCAStrategy:
         strategy = DCAStrategy(dca_strategy_config)
         
         assert strategy.name == 'dca'
-        assert strategy.interval_hours == 24
+        assert strategy.min_interval_hours == 24
         assert strategy.amount_usd == 100
         assert strategy.max_price == 70000
         assert strategy.min_price == 60000
@@ -27,80 +80,47 @@ class TestDCAStrategy:
         assert strategy.total_spent == 0.0
         assert strategy.purchase_count == 0
     
-    def test_strategy_initialization(self, dca_strategy_config):
+    def test_strategy_initialization(self, dca_strategy_config, mock_bot):
         """Test strategy initialization with bot instance."""
         strategy = DCAStrategy(dca_strategy_config)
-        bot = Mock()
-        
-        strategy.initialize(bot)
-        
-        assert strategy.bot == bot
-    
-    def test_analyze_first_purchase(self, dca_strategy_config, market_data):
-        """Test first purchase (no previous purchase)."""
-        strategy = DCAStrategy(dca_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
         
-        signal = strategy.analyze(market_data)
+        strategy.initialize(mock_bot)
         
-        assert signal['action'] == 'buy'
-        assert signal['confidence'] == 1.0
-        assert 'metadata' in signal
-        assert 'price' in signal['metadata']
-        assert 'amount' in signal['metadata']
-        
-        # Check amount calculation
-        expected_amount = strategy.amount_usd / market_data['last']
-        assert abs(signal['metadata']['amount'] - expected_amount) < 0.00000001
+        assert strategy.bot == mock_bot
     
-    def test_analyze_interval_not_reached(self, dca_strategy_config, market_data):
-        """Test when interval hasn't been reached yet."""
-        strategy = DCAStrategy(dca_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
-        
-        # Set last purchase time to now
-        strategy.last_purchase_time = time.time()
-        
-        signal = strategy.analyze(market_data)
-        
-        assert signal['action'] == 'hold'
-        assert 'Next purchase in' in signal['reason']
+    @pytest.mark.parametrize('mutator,price,action,reason', [
+        (None, 67450.0, 'buy', None),
+        (lambda s, now: setattr(s, 'last_purchase_time', now), 67450.0, 'hold', 'Min interval not met'),
+        (None, 75000.0, 'hold', 'above max'),
+        (None, 55000.0, 'hold', 'below min'),
+    ], ids=['first_purchase', 'interval_not_reached', 'price_above_max', 'price_below_min'])
+    def test_analyze(self, dca_strategy, dca_market_data, frozen_time, mutator, price, action, reason):
+        """Test buy/hold decisions for purchase interval and price limits."""
+        strategy = dca_strategy
+        strategy.last_purchase_time = None
+        if mutator:
+            mutator(strategy, frozen_time)
+        dca_market_data['last'] = price
+        
+        signal = strategy.analyze(dca_market_data)
+        
+        assert signal['action'] == action
+        if reason:
+            assert reason in signal['reason']
+        else:
+            assert signal['confidence'] == 1.0
+            assert 'metadata' in signal
+            assert 'price' in signal['metadata']
+            assert 'amount' in signal['metadata']
+            
+            # Check amount calculation
+            expected_amount = strategy.amount_usd / dca_market_data['last']
+            assert signal['metadata']['amount'] == pytest.approx(expected_amount, abs=1e-8)
     
-    def test_analyze_price_above_max(self, dca_strategy_config, market_data):
-        """Test when price is above max_price."""
-        strategy = DCAStrategy(dca_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
-        
-        # Set price above max
-        market_data['last'] = 75000.0
-        
-        signal = strategy.analyze(market_data)
-        
-        assert signal['action'] == 'hold'
-        assert 'above max' in signal['reason']
-    
-    def test_analyze_price_below_min(self, dca_strategy_config, market_data):
-        """Test when price is below min_price."""
-        strategy = DCAStrategy(dca_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
-        
-        # Set price below min
-        market_data['last'] = 55000.0
-        
-        signal = strategy.analyze(market_data)
-        
-        assert signal['action'] == 'hold'
-        assert 'below min' in signal['reason']
-    
-    def test_on_order_filled(self, dca_strategy_config):
+    def test_on_order_filled(self, dca_strategy_config, mock_bot):
         """Test order filled event updates stats."""
         strategy = DCAStrategy(dca_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
+        strategy.initialize(mock_bot)
         
         # Simulate order fill
         order = {
@@ -119,14 +139,13 @@ class TestDCAStrategy:
         assert strategy.total_spent == 674.50
         assert strategy.last_purchase_time is not None
     
-    def test_get_state(self, dca_strategy_config):
+    def test_get_state(self, dca_strategy_config, mock_bot, frozen_time):
         """Test get_state method."""
         strategy = DCAStrategy(dca_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
+        strategy.initialize(mock_bot)
         
         # Set some state
-        strategy.last_purchase_time = time.time()
+        strategy.last_purchase_time = frozen_time
         strategy.total_purchased = 0.05
         strategy.total_spent = 3000.0
         strategy.purchase_count = 5
@@ -137,19 +156,19 @@ class TestDCAStrategy:
         assert 'total_purchased' in state
         assert 'total_spent' in state
         assert 'purchase_count' in state
+        assert state['last_purchase_time'] == frozen_time
         assert state['total_purchased'] == 0.05
         assert state['total_spent'] == 3000.0
         assert state['purchase_count'] == 5
     
-    def test_restore_state(self, dca_strategy_config):
+    def test_restore_state(self, dca_strategy_config, mock_bot, frozen_time):
         """Test restore_state method."""
         strategy = DCAStrategy(dca_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
+        strategy.initialize(mock_bot)
         
         # Create state
         state = {
-            'last_purchase_time': time.time(),
+            'last_purchase_time': frozen_time,
             'total_purchased': 0.1,
             'total_spent': 6000.0,
             'purchase_count': 10
@@ -158,29 +177,54 @@ class TestDCAStrategy:
         # Restore state
         strategy.restore_state(state)
         
-        assert strategy.last_purchase_time == state['last_purchase_time']
+        assert strategy.last_purchase_time == frozen_time
         assert strategy.total_purchased == 0.1
         assert strategy.total_spent == 6000.0
         assert strategy.purchase_count == 10
     
-    def test_average_price_calculation(self, dca_strategy_config):
+    def test_sell_price_after_fill(self, dca_strategy_config, mock_bot):
+        """Test the sell target follows the filled buy price and its inputs."""
+        strategy = DCAStrategy(dca_strategy_config)
+        strategy.initialize(mock_bot)
+        
+        strategy.on_order_filled(dict(AVERAGING_ORDERS[0]))
+        
+        assert strategy.get_sell_price() == _sell_price(strategy, 60000.0)
+        assert strategy.pending_sell_order['target_sell_price'] == strategy.get_sell_price()
+        
+        # Changed inputs are picked up instead of returning the stale value
+        strategy.profit_target = 2.0
+        assert strategy.get_sell_price() == _sell_price(strategy, 60000.0)
+        strategy.last_purchase_price = 65000.0
+        assert strategy.get_sell_price() == _sell_price(strategy, 65000.0)
+    
+    def test_sell_price_after_restore(self, dca_strategy_config, mock_bot):
+        """Test the sell target is available for a restored purchase."""
+        strategy = DCAStrategy(dca_strategy_config)
+        strategy.initialize(mock_bot)
+        
+        strategy.restore_state({'last_purchase_price': 67450.0, 'purchase_count': 1})
+        
+        assert strategy.get_sell_price() == _sell_price(strategy, 67450.0)
+    
+    def test_sell_price_without_purchase(self, dca_strategy_config, mock_bot):
+        """Test there is no sell target before any purchase."""
+        strategy = DCAStrategy(dca_strategy_config)
+        strategy.initialize(mock_bot)
+        
+        assert strategy.get_sell_price() == 0.0
+        
+        strategy.restore_state({})
+        assert strategy.get_sell_price() == 0.0
+    
+    def test_average_price_calculation(self, dca_strategy_config, mock_bot):
         """Test average price calculation."""
         strategy = DCAStrategy(dca_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
+        strategy.initialize(mock_bot)
         
         # Simulate multiple purchases
-        orders = [
-            {'price': 60000.0, 'amount': 0.01, 'cost': 600.0},
-            {'price': 65000.0, 'amount': 0.01, 'cost': 650.0},
-            {'price': 70000.0, 'amount': 0.01, 'cost': 700.0},
-        ]
-        
-        for order in orders:
-            order['id'] = 'test'
-            order['side'] = 'buy'
-            order['filled'] = order['amount']
-            strategy.on_order_filled(order)
+        for order in AVERAGING_ORDERS:
+            strategy.on_order_filled(dict(order))
         
         # Calculate average price
         average_price = strategy.total_spent / strategy.total_purchased
@@ -188,14 +232,14 @@ class TestDCAStrategy:
         assert strategy.purchase_count == 3
         assert strategy.total_purchased == 0.03
         assert strategy.total_spent == 1950.0
-        assert abs(average_price - 65000.0) < 0.01
+        assert average_price == pytest.approx(65000.0, abs=0.01)
     
     def test_custom_parameters(self):
         """Test strategy with custom parameters."""
         config = {
             'name': 'dca',
             'params': {
-                'interval_hours': 12,  # Every 12 hours
+                'min_interval_hours': 12,  # At most every 12 hours
                 'amount_usd': 50,      # $50 per purchase
                 'max_price': 80000,
                 'min_price': 50000
@@ -204,28 +248,28 @@ class TestDCAStrategy:
         
         strategy = DCAStrategy(config)
         
-        assert strategy.interval_hours == 12
+        assert strategy.min_interval_hours == 12
         assert strategy.amount_usd == 50
         assert strategy.max_price == 80000
         assert strategy.min_price == 50000
     
-    def test_no_price_limits(self):
+    def test_no_price_limits(self, dca_strategy_config, mock_bot):
         """Test DCA without price limits."""
         config = {
             'name': 'dca',
             'params': {
-                'interval_hours': 24,
-                'amount_usd': 100
+                'min_interval_hours': 24,
+                'amount_usd': 100,
+                'indicators': dca_strategy_config['params']['indicators']
                 # No max_price or min_price
             }
         }
         
         strategy = DCAStrategy(config)
-        bot = Mock()
-        strategy.initialize(bot)
+        strategy.initialize(mock_bot)
         
         # Should buy at any price
-        market_data = {'last': 100000.0}  # Very high price
+        market_data = {'last': 100000.0, 'ohlcv': OHLCV}  # Very high price
         signal = strategy.analyze(market_data)
         
         assert signal['action'] == 'buy'
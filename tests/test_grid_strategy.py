@@ -2,41 +2,128 @@
 Tests for Grid Trading Strategy
 
 Tests the grid trading strategy implementation.
+
+Safe for pytest-xdist: tests only read the module-scoped fixtures and modify
+their own copies (fresh_strategy, fresh_primed_strategy), so they can be
+distributed across workers without an xdist_group.
 """
 
+import copy
+import functools
+import time
+import timeit
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock
+from plugins.strategies._grid_jit import grid_prices
 from plugins.strategies.grid_trading import GridTradingStrategy
 
 
+# Time budget for one 10,000-level grid calculation, about 10x a typical run
+GRID_LEVELS_BUDGET = 0.05
+
+
+@functools.lru_cache(maxsize=1)
+def _stub_bot():
+    """Bot stand-in for strategies whose tests never call into the bot."""
+    return SimpleNamespace()
+
+
+def _copy_strategy(strategy):
+    """Deep copy a strategy's state, sharing its (read-only) config and bot."""
+    shared = (strategy.config, strategy.params, strategy.bot, strategy._get_market_data)
+    return copy.deepcopy(strategy, {id(obj): obj for obj in shared})
+
+
+def _split_sides(levels):
+    """Split grid levels into (buy, sell) lists in one pass, keeping their order."""
+    buys, sells = [], []
+    for level in levels:
+        (buys if level['side'] == 'buy' else sells).append(level)
+    return buys, sells
+
+
+def _order_set(orders):
+    """(side, price rounded to cents) for each order."""
+    return {(o['side'], round(o['price'], 2)) for o in orders}
+
+
+def _orders_by_price(orders, side):
+    """Index one side's orders by price rounded to cents."""
+    return {round(o['price'], 2): o for o in orders if o['side'] == side}
+
+
+@pytest.fixture(scope="module")
+def market_data(_market_data_base):
+    """Sample market data (read-only; the grid strategy never modifies it)."""
+    return _market_data_base
+
+
+@pytest.fixture(scope="module")
+def initialized_strategy(grid_strategy_config):
+    """Initialized strategy and its bot, shared by the tests in this module (don't mutate)."""
+    strategy = GridTradingStrategy(grid_strategy_config)
+    bot = _stub_bot()
+    strategy.initialize(bot)
+    return strategy, bot
+
+
+@pytest.fixture
+def fresh_strategy(initialized_strategy):
+    """Modifiable copy of the initialized strategy."""
+    return _copy_strategy(initialized_strategy[0])
+
+
+@pytest.fixture(scope="module")
+def primed_state(initialized_strategy, market_data):
+    """Strategy state with the initial grid placed, captured once (don't mutate)."""
+    strategy = _copy_strategy(initialized_strategy[0])
+    strategy.analyze(market_data)
+    return strategy.get_state()
+
+
+@pytest.fixture(scope="module")
+def grid_levels(initialized_strategy, market_data):
+    """Grid levels around the market price, computed once for the module (don't mutate)."""
+    strategy = _copy_strategy(initialized_strategy[0])
+    strategy.current_price = market_data['last']
+    return tuple(strategy._calculate_grid_levels())
+
+
+@pytest.fixture
+def fresh_primed_strategy(fresh_strategy, primed_state):
+    """Modifiable strategy with the initial grid placed, restored from the snapshot."""
+    fresh_strategy.restore_state(copy.deepcopy(primed_state))
+    return fresh_strategy
+
+
 class TestGridTradingStrategy:
     """Test GridTradingStrategy class."""
     
-    def test_strategy_creation(self, grid_strategy_config):
+    @pytest.mark.parametrize('attr,expected', [
+        ('name', 'grid_trading'),
+        ('grid_spacing', 2.5),
+        ('_step_pct', 0.025),  # grid_spacing as a fraction, computed once
+        ('grid_levels', 10),
+        ('position_size', 100),
+        ('grid_orders', []),
+        ('current_price', None),
+    ])
+    def test_strategy_creation(self, initialized_strategy, attr, expected):
         """Test strategy creation."""
-        strategy = GridTradingStrategy(grid_strategy_config)
+        strategy, _ = initialized_strategy
         
-        assert strategy.name == 'grid_trading'
-        assert strategy.grid_spacing == 2.5
-        assert strategy.grid_levels == 10
-        assert strategy.position_size == 100
-        assert strategy.grid_orders == []
-        assert strategy.current_price is None
+        assert getattr(strategy, attr) == expected
     
-    def test_strategy_initialization(self, grid_strategy_config):
+    def test_strategy_initialization(self, initialized_strategy):
         """Test strategy initialization with bot instance."""
-        strategy = GridTradingStrategy(grid_strategy_config)
-        bot = Mock()
-        
-        strategy.initialize(bot)
+        strategy, bot = initialized_strategy
         
         assert strategy.bot == bot
     
-    def test_analyze_no_price(self, grid_strategy_config):
+    def test_analyze_no_price(self, fresh_strategy):
         """Test analyze with no price data."""
-        strategy = GridTradingStrategy(grid_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
+        strategy = fresh_strategy
         
         market_data = {'symbol': 'BTC/USD'}
         signal = strategy.analyze(market_data)
@@ -45,11 +132,9 @@ class TestGridTradingStrategy:
         assert signal['confidence'] == 0.0
         assert 'No price data' in signal['reason']
     
-    def test_analyze_first_run(self, grid_strategy_config, market_data):
+    def test_analyze_first_run(self, fresh_strategy, market_data):
         """Test analyze on first run (places grid orders)."""
-        strategy = GridTradingStrategy(grid_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
+        strategy = fresh_strategy
         
         signal = strategy.analyze(market_data)
         
@@ -59,122 +144,127 @@ class TestGridTradingStrategy:
         assert 'grid_orders' in signal['metadata']
         assert len(strategy.grid_orders) == 20  # 10 buy + 10 sell levels
     
-    def test_grid_level_calculation(self, grid_strategy_config, market_data):
+    def test_grid_level_calculation(self, grid_levels, market_data):
         """Test grid level calculation."""
-        strategy = GridTradingStrategy(grid_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
-        strategy.current_price = market_data['last']
-        
-        levels = strategy._calculate_grid_levels()
+        levels = grid_levels
+        current_price = market_data['last']
         
         assert len(levels) == 20  # 10 buy + 10 sell
+        buy_levels, sell_levels = _split_sides(levels)
         
         # Check buy levels (below current price)
-        buy_levels = [l for l in levels if l['side'] == 'buy']
         assert len(buy_levels) == 10
         for level in buy_levels:
-            assert level['price'] < strategy.current_price
+            assert level['price'] < current_price
         
         # Check sell levels (above current price)
-        sell_levels = [l for l in levels if l['side'] == 'sell']
         assert len(sell_levels) == 10
         for level in sell_levels:
-            assert level['price'] > strategy.current_price
+            assert level['price'] > current_price
     
-    def test_grid_spacing(self, grid_strategy_config, market_data):
+    def test_grid_spacing(self, initialized_strategy, grid_levels, market_data):
         """Test grid spacing is correct."""
-        strategy = GridTradingStrategy(grid_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
-        strategy.current_price = market_data['last']
+        strategy, _ = initialized_strategy
+        levels = grid_levels
+        current_price = market_data['last']
         
-        levels = strategy._calculate_grid_levels()
+        buy_levels, sell_levels = _split_sides(levels)
+        step = strategy._step_pct
         
         # Check first buy level
-        first_buy = [l for l in levels if l['side'] == 'buy'][0]
-        expected_price = strategy.current_price * (1 - strategy.grid_spacing / 100)
-        assert abs(first_buy['price'] - expected_price) < 0.01
+        first_buy = buy_levels[0]
+        expected_price = current_price * (1 - step)
+        assert first_buy['price'] == pytest.approx(expected_price, abs=0.01)
         
         # Check first sell level
-        first_sell = [l for l in levels if l['side'] == 'sell'][0]
-        expected_price = strategy.current_price * (1 + strategy.grid_spacing / 100)
-        assert abs(first_sell['price'] - expected_price) < 0.01
+        first_sell = sell_levels[0]
+        expected_price = current_price * (1 + step)
+        assert first_sell['price'] == pytest.approx(expected_price, abs=0.01)
     
-    def test_on_order_filled_buy(self, grid_strategy_config, market_data):
-        """Test order filled event for buy order."""
-        strategy = GridTradingStrategy(grid_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
-        
-        # Place initial grid
-        strategy.analyze(market_data)
-        initial_count = len(strategy.grid_orders)
+    @pytest.mark.parametrize('levels,spacing', [
+        (10, 2.5),
+        (100, 1.0),
+        (1000, 0.5),
+    ])
+    def test_grid_kernel_matches_reference(self, market_data, levels, spacing):
+        """Test the loaded grid kernel (AOT, Numba or NumPy) matches the per-level price formula."""
+        strategy = GridTradingStrategy({
+            'name': 'grid_trading',
+            'params': {'grid_spacing': spacing, 'grid_levels': levels}
+        })
+        current_price = strategy.current_price = market_data['last']
+        step = strategy.current_price * strategy._step_pct
         
-        # Simulate buy order fill
-        order = {
-            'id': 'test_123',
-            'side': 'buy',
-            'price': 67000.0,
-            'amount': 0.01,
-            'status': 'closed'
-        }
+        # Scalar reference: level i sits i grid spacings away from the current price
+        expected_buy = [current_price * (1 - spacing / 100 * i) for i in range(1, levels + 1)]
+        expected_sell = [current_price * (1 + spacing / 100 * i) for i in range(1, levels + 1)]
         
-        strategy.on_order_filled(order)
+        buy_prices, sell_prices = grid_prices(strategy.current_price, step, levels)
         
-        # Should have removed the filled order and added a sell order
-        assert len(strategy.grid_orders) == initial_count
+        assert buy_prices.tolist() == pytest.approx(expected_buy, rel=1e-12)
+        assert sell_prices.tolist() == pytest.approx(expected_sell, rel=1e-12)
         
-        # Check that a sell order was added above the buy price
-        sell_orders = [o for o in strategy.grid_orders if o['side'] == 'sell']
-        expected_sell_price = order['price'] * (1 + strategy.grid_spacing / 100)
-        sell_at_expected_price = any(
-            abs(o['price'] - expected_sell_price) < 0.01 
-            for o in sell_orders
-        )
-        assert sell_at_expected_price
+        # The dict levels the strategy hands out carry the same prices, buys first
+        level_prices = [level['price'] for level in strategy._calculate_grid_levels()]
+        assert level_prices == pytest.approx(expected_buy + expected_sell, rel=1e-12)
     
-    def test_on_order_filled_sell(self, grid_strategy_config, market_data):
-        """Test order filled event for sell order."""
-        strategy = GridTradingStrategy(grid_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
+    @pytest.mark.benchmark
+    def test_grid_levels_benchmark(self, market_data, record_property):
+        """Test a 10,000-level grid is calculated within the time budget (run with --run-benchmarks)."""
+        strategy = GridTradingStrategy({
+            'name': 'grid_trading',
+            'params': {'grid_spacing': 0.01, 'grid_levels': 10000, 'position_size': 1}
+        })
+        strategy.initialize(_stub_bot())
+        strategy.current_price = market_data['last']
         
-        # Place initial grid
-        strategy.analyze(market_data)
-        initial_count = len(strategy.grid_orders)
+        # The first call includes any JIT compile or cache load
+        start = time.perf_counter()
+        levels = strategy._calculate_grid_levels()
+        first_call = time.perf_counter() - start
+        
+        best = min(timeit.repeat(strategy._calculate_grid_levels, number=1, repeat=20))
+        record_property('first_call_ms', round(first_call * 1000, 2))
+        record_property('best_ms', round(best * 1000, 2))
         
-        # Simulate sell order fill
+        assert len(levels) == 20000
+        assert best < GRID_LEVELS_BUDGET, f"best run {best * 1000:.2f} ms"
+    
+    @pytest.mark.parametrize('side,counter_side,sign', [
+        ('buy', 'sell', +1),
+        ('sell', 'buy', -1),
+    ], ids=['buy', 'sell'])
+    def test_on_order_filled(self, fresh_primed_strategy, primed_state, side, counter_side, sign):
+        """Test order filled event places the opposite order one grid step away."""
+        strategy = fresh_primed_strategy
+        before = _order_set(strategy.grid_orders)
+        
+        # Fill the grid's nearest order on this side
+        filled = next(o for o in primed_state['grid_orders'] if o['side'] == side)
+        price = filled['price']
         order = {
-            'id': 'test_456',
-            'side': 'sell',
-            'price': 68000.0,
-            'amount': 0.01,
+            'id': f'test_{side}',
+            'side': side,
+            'price': price,
+            'amount': filled['amount'],
             'status': 'closed'
         }
         
         strategy.on_order_filled(order)
         
-        # Should have removed the filled order and added a buy order
-        assert len(strategy.grid_orders) == initial_count
+        # Should have removed only the filled order and added only a counter
+        # order one step above (buy) or below (sell)
+        after = _order_set(strategy.grid_orders)
+        expected_price = round(price * (1 + sign * strategy._step_pct), 2)
+        assert before - after == {(side, round(price, 2))}
+        assert after - before == {(counter_side, expected_price)}
         
-        # Check that a buy order was added below the sell price
-        buy_orders = [o for o in strategy.grid_orders if o['side'] == 'buy']
-        expected_buy_price = order['price'] * (1 - strategy.grid_spacing / 100)
-        buy_at_expected_price = any(
-            abs(o['price'] - expected_buy_price) < 0.01 
-            for o in buy_orders
-        )
-        assert buy_at_expected_price
+        counter_orders = _orders_by_price(strategy.grid_orders, counter_side)
+        assert counter_orders[expected_price]['amount'] == order['amount']
     
-    def test_on_order_cancelled(self, grid_strategy_config, market_data):
+    def test_on_order_cancelled(self, fresh_primed_strategy):
         """Test order cancelled event."""
-        strategy = GridTradingStrategy(grid_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
-        
-        # Place initial grid
-        strategy.analyze(market_data)
+        strategy = fresh_primed_strategy
         initial_count = len(strategy.grid_orders)
         
         # Get first order
@@ -193,14 +283,9 @@ class TestGridTradingStrategy:
         # Should have removed the cancelled order
         assert len(strategy.grid_orders) == initial_count - 1
     
-    def test_get_state(self, grid_strategy_config, market_data):
+    def test_get_state(self, fresh_primed_strategy, market_data):
         """Test get_state method."""
-        strategy = GridTradingStrategy(grid_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
-        
-        # Place grid
-        strategy.analyze(market_data)
+        strategy = fresh_primed_strategy
         
         # Get state
         state = strategy.get_state()
@@ -210,11 +295,9 @@ class TestGridTradingStrategy:
         assert len(state['grid_orders']) == 20
         assert state['current_price'] == market_data['last']
     
-    def test_restore_state(self, grid_strategy_config):
+    def test_restore_state(self, fresh_strategy):
         """Test restore_state method."""
-        strategy = GridTradingStrategy(grid_strategy_config)
-        bot = Mock()
-        strategy.initialize(bot)
+        strategy = fresh_strategy
         
         # Create state
         state = {
@@ -231,20 +314,127 @@ class TestGridTradingStrategy:
         assert len(strategy.grid_orders) == 2
         assert strategy.current_price == 67500.0
     
-    def test_custom_parameters(self):
+    @pytest.mark.parametrize('grid_spacing,grid_levels,position_size', [
+        (5.0, 5, 200),
+        (1.0, 20, 50),
+    ], ids=['wide', 'narrow'])
+    def test_custom_parameters(self, grid_spacing, grid_levels, position_size):
         """Test strategy with custom parameters."""
         config = {
             'name': 'grid_trading',
             'params': {
-                'grid_spacing': 5.0,  # 5% spacing
-                'grid_levels': 5,     # 5 levels
-                'position_size': 200  # $200 per level
+                'grid_spacing': grid_spacing,    # % spacing
+                'grid_levels': grid_levels,      # levels per side
+                'position_size': position_size   # $ per level
             }
         }
         
         strategy = GridTradingStrategy(config)
         
-        assert strategy.grid_spacing == 5.0
-        assert strategy.grid_levels == 5
-        assert strategy.position_size == 200
+        assert strategy.grid_spacing == grid_spacing
+        assert strategy.grid_levels == grid_levels
+        assert strategy.position_size == position_size
 
+    
+    def test_fresh_strategies_are_isolated(self, initialized_strategy, primed_state, fresh_primed_strategy):
+        """Test per-test strategies don't share mutable state with the module fixtures."""
+        strategy = fresh_primed_strategy
+        other = _copy_strategy(initialized_strategy[0])
+        other.restore_state(copy.deepcopy(primed_state))
+        
+        assert strategy is not initialized_strategy[0]
+        assert strategy.grid_orders is not primed_state['grid_orders']
+        assert strategy.grid_orders is not other.grid_orders
+        assert strategy._price_index is not other._price_index
+        
+        strategy.grid_orders[0]['amount'] = 0
+        strategy.grid_orders.pop()
+        
+        assert len(primed_state['grid_orders']) == len(other.grid_orders) == 20
+        assert primed_state['grid_orders'][0]['amount'] != 0
+        assert initialized_strategy[0].grid_orders == []
+    
+    def test_order_removal_keeps_price_index_consistent(self, fresh_primed_strategy):
+        """Test filled/cancelled orders are removed and the price index stays in sync."""
+        strategy = fresh_primed_strategy
+        initial_count = len(strategy.grid_orders)
+        
+        orders = strategy.grid_orders
+        
+        # Cancel an order from the middle of the grid
+        cancelled = strategy.grid_orders[3]
+        strategy.on_order_cancelled(dict(cancelled))
+        
+        # Removed in place - no new list is allocated per event
+        assert strategy.grid_orders is orders
+        assert len(strategy.grid_orders) == initial_count - 1
+        assert cancelled['price'] not in [o['price'] for o in strategy.grid_orders]
+        
+        # Unknown prices are ignored
+        strategy.on_order_cancelled({'side': 'buy', 'price': 1.0, 'amount': 0.01})
+        assert len(strategy.grid_orders) == initial_count - 1
+        
+        # Every remaining order is indexed at its current position
+        for i, o in enumerate(strategy.grid_orders):
+            assert i in strategy._price_index[strategy._price_key(o['price'])]
+    
+    def test_orders_at_same_price_kept_and_removed_together(self, fresh_primed_strategy):
+        """Test duplicate prices keep every order and a fill removes all of them."""
+        strategy = fresh_primed_strategy
+        initial_count = len(strategy.grid_orders)
+        duplicate = dict(strategy.grid_orders[2], amount=0.5)
+        
+        strategy._add_grid_order(duplicate)
+        assert len(strategy.grid_orders) == initial_count + 1
+        
+        strategy.on_order_cancelled(dict(duplicate))
+        
+        assert len(strategy.grid_orders) == initial_count - 1
+        assert duplicate['price'] not in [o['price'] for o in strategy.grid_orders]
+        for i, o in enumerate(strategy.grid_orders):
+            assert i in strategy._price_index[strategy._price_key(o['price'])]
+    
+    def test_restored_duplicate_prices_all_indexed(self, grid_strategy_config, primed_state):
+        """Test restore_state indexes every order at a repeated price."""
+        strategy = GridTradingStrategy(grid_strategy_config)
+        orders = copy.deepcopy(primed_state['grid_orders'])
+        duplicate = dict(orders[0], amount=0.5)
+        orders.append(duplicate)
+        
+        strategy.restore_state({'grid_orders': orders, 'current_price': primed_state['current_price']})
+        strategy.on_order_cancelled(dict(duplicate))
+        
+        assert len(strategy.grid_orders) == len(primed_state['grid_orders']) - 1
+        assert duplicate['price'] not in [o['price'] for o in strategy.grid_orders]
+    
+    def test_indicators_computed_once_per_bar(self, grid_strategy_config):
+        """Test indicator values are reused until a new OHLCV bar arrives."""
+        import pandas as pd
+        from unittest.mock import patch
+        
+        strategy = GridTradingStrategy(grid_strategy_config)
+        bot = Mock()
+        df = pd.DataFrame({
+            'timestamp': range(60),
+            'open': [100.0] * 60,
+            'high': [101.0] * 60,
+            'low': [99.0] * 60,
+            'close': [100.0] * 60,
+            'volume': [1.0] * 60
+        })
+        bot.get_market_data.return_value = {'ohlcv': df}
+        strategy.initialize(bot)
+        
+        with patch('plugins.strategies.grid_trading.TechnicalIndicators') as ti:
+            ti.get_rsi.return_value = (30.0, False)
+            ti.is_macd_rising.return_value = True
+            
+            assert strategy._validate_indicators(is_buy=True)
+            assert strategy._validate_indicators(is_buy=False) is False
+            assert ti.get_rsi.call_count == 1
+            assert ti.is_macd_rising.call_count == 1
+            
+            # New bar invalidates the cache
+            bot.get_market_data.return_value = {'ohlcv': df.assign(timestamp=df['timestamp'] + 1)}
+            strategy._validate_indicators(is_buy=True)
+            assert ti.get_rsi.call_count == 2
@@ -0,0 +1,211 @@
+"""
+Tests for Order Signing
+
+Tests HMAC request signing against reference HMAC output.
+"""
+
+import base64
+import hashlib
+import hmac
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from security.order_signing import (
+    HMACOrderSigner,
+    BinanceOrderSigner,
+    CoinbaseOrderSigner,
+    get_order_signer
+)
+
+
+class TestHMACOrderSigner:
+    """Test HMACOrderSigner class."""
+    
+    def test_sign_message_matches_reference(self):
+        """Test signature matches hmac.new reference output."""
+        signer = HMACOrderSigner()
+        message = 'symbol=BTCUSD&side=BUY&timestamp=1234567890'
+        
+        expected = hmac.new(b'secret', message.encode(), hashlib.sha256).hexdigest()
+        
+        assert signer._sign_message(message, 'secret') == expected
+    
+    def test_sign_message_sha512(self):
+        """Test non-default hash algorithm."""
+        signer = HMACOrderSigner(hash_algo='sha512')
+        
+        expected = hmac.new(b'secret', b'message', hashlib.sha512).hexdigest()
+        
+        assert signer._sign_message('message', 'secret') == expected
+    
+    def test_sign_request(self):
+        """Test signed params include timestamp and a valid signature."""
+        signer = BinanceOrderSigner()
+        params = {'symbol': 'BTCUSD', 'side': 'BUY', 'quantity': 0.01}
+        
+        with patch('security.order_signing.time_ns', return_value=1234567890123456789):
+            signed_params, headers = signer.sign_request('POST', '/api/v3/order', params, 'secret')
+        
+        assert signed_params['timestamp'] == 1234567890123
+        assert signed_params['recvWindow'] == 5000
+        assert 'X-MBX-APIKEY' in headers
+        
+        query_string = (
+            'quantity=0.01&recvWindow=5000&side=BUY'
+            '&symbol=BTCUSD&timestamp=1234567890123'
+        )
+        assert signer.verify_signature(signed_params['signature'], query_string, 'secret')
+    
+    def test_keyed_hmac_cache_is_bounded(self):
+        """Test pre-keyed HMAC objects are reused and the cache stays bounded."""
+        signer = HMACOrderSigner()
+        
+        for i in range(20):
+            signer._sign_message('message', f'secret{i}')
+            signer._sign_message('message', f'secret{i}')
+        
+        assert len(signer._secret_cache) == HMACOrderSigner._SECRET_CACHE_SIZE
+        assert 'secret19' in signer._secret_cache
+        assert 'secret0' not in signer._secret_cache
+        
+        expected = hmac.new(b'secret19', b'message', hashlib.sha256).hexdigest()
+        assert signer._sign_message('message', 'secret19') == expected
+    
+    def test_keyed_hmac_cache_thread_safe(self):
+        """Test a shared signer evicts secrets safely from many threads."""
+        signer = HMACOrderSigner()
+        secrets = [f'secret{i}' for i in range(200)]
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            signatures = list(pool.map(lambda secret: signer._sign_message('message', secret), secrets))
+        
+        assert signatures == [
+            hmac.new(secret.encode(), b'message', hashlib.sha256).hexdigest()
+            for secret in secrets
+        ]
+        assert len(signer._secret_cache) == HMACOrderSigner._SECRET_CACHE_SIZE
+    
+    @pytest.mark.parametrize('params', [
+        {'symbol': 'BTCUSD', 'quantity': 0.01, 'price': 67000, 'flag': True},
+        {'symbol': 'BTC/USD', 'note': 'a b&c=d'},
+        {'clientOrderId': 'x~y_z-1.2'},
+    ])
+    def test_query_string_matches_urlencode(self, params):
+        """Test fast-path query string is identical to urlencode output."""
+        from urllib.parse import urlencode
+        signer = HMACOrderSigner()
+        
+        assert signer._create_query_string(params) == urlencode(sorted(params.items()))
+    
+    def test_sign_request_str(self):
+        """Test signed query string carries the same signature as sign_request."""
+        signer = BinanceOrderSigner()
+        
+        with patch('security.order_signing.time_ns', return_value=1234567890123456789):
+            signed_params, _ = signer.sign_request('GET', '/api/v3/order', {'symbol': 'BTCUSD'}, 'secret')
+            query_string, _ = signer.sign_request_str('GET', '/api/v3/order', {'symbol': 'BTCUSD'}, 'secret')
+        
+        assert query_string == (
+            'recvWindow=5000&symbol=BTCUSD&timestamp=1234567890123'
+            f"&signature={signed_params['signature']}"
+        )
+    
+    def test_sign_request_inplace(self):
+        """Test in-place signing matches sign_request and reuses the dict."""
+        signer = BinanceOrderSigner()
+        params = {'symbol': 'BTCUSD'}
+        
+        with patch('security.order_signing.time_ns', return_value=1234567890123456789):
+            signed_params, _ = signer.sign_request('GET', '/api/v3/order', {'symbol': 'BTCUSD'}, 'secret')
+            inplace_params, _ = signer.sign_request_inplace('GET', '/api/v3/order', params, 'secret')
+        
+        assert inplace_params is params
+        assert inplace_params == signed_params
+    
+    def test_sign_batch_matches_sign_request(self):
+        """Test batch signing gives the same results as per-request signing."""
+        signer = BinanceOrderSigner()
+        requests = [
+            ('DELETE', '/api/v3/order', {'symbol': 'BTCUSD', 'orderId': i})
+            for i in range(3)
+        ]
+        
+        with patch('security.order_signing.time_ns', return_value=1234567890123456789):
+            batch = signer.sign_batch(requests, 'secret')
+            single = [
+                signer.sign_request(method, endpoint, dict(params), 'secret')
+                for method, endpoint, params in requests
+            ]
+        
+        assert batch == single
+        assert batch[0][0]['recvWindow'] == 5000
+    
+    def test_verify_signature_rejects_wrong_signature(self):
+        """Test verification fails for a tampered signature."""
+        signer = HMACOrderSigner()
+        
+        assert not signer.verify_signature('00' * 32, 'message', 'secret')
+    
+    def test_verify_signature_rejects_invalid_hex(self):
+        """Test verification fails for a signature that is not hex."""
+        signer = HMACOrderSigner()
+        
+        assert not signer.verify_signature('not-a-signature', 'message', 'secret')
+    
+    def test_verify_signature_requires_canonical_hex(self):
+        """Test only the lowercase, unspaced hexdigest form verifies."""
+        signer = HMACOrderSigner()
+        signature = hmac.new(b'secret', b'message', hashlib.sha256).hexdigest()
+        spaced = ' '.join(signature[i:i + 2] for i in range(0, len(signature), 2))
+        
+        assert signer.verify_signature(signature, 'message', 'secret')
+        assert not signer.verify_signature(signature.upper(), 'message', 'secret')
+        assert not signer.verify_signature(spaced, 'message', 'secret')
+        assert not signer.verify_signature(signature + '\n', 'message', 'secret')
+
+
+class TestCoinbaseOrderSigner:
+    """Test CoinbaseOrderSigner class."""
+    
+    def test_sign_request(self):
+        """Test Coinbase signature header matches reference output."""
+        signer = CoinbaseOrderSigner()
+        secret = base64.b64encode(b'coinbase-secret').decode()
+        params = {'side': 'buy', 'size': '0.01'}
+        
+        _, headers = signer.sign_request('POST', '/orders', params, secret, 'phrase')
+        
+        message = headers['CB-ACCESS-TIMESTAMP'] + 'POST' + '/orders' + '{"side": "buy", "size": "0.01"}'
+        expected = base64.b64encode(
+            hmac.new(b'coinbase-secret', message.encode(), hashlib.sha256).digest()
+        ).decode()
+        
+        assert headers['CB-ACCESS-SIGN'] == expected
+        assert headers['CB-ACCESS-PASSPHRASE'] == 'phrase'
+    
+    def test_timestamp_format(self):
+        """Test timestamp is seconds with exact microsecond decimals."""
+        signer = CoinbaseOrderSigner()
+        secret = base64.b64encode(b'coinbase-secret').decode()
+        
+        with patch('security.order_signing.time_ns', return_value=1234567890000123999):
+            _, headers = signer.sign_request('GET', '/accounts', {}, secret)
+        
+        assert headers['CB-ACCESS-TIMESTAMP'] == '1234567890.000123'
+
+
+@pytest.mark.parametrize('exchange, signer_class', [
+    ('binance', BinanceOrderSigner),
+    ('Binance_US', BinanceOrderSigner),
+    ('coinbase', CoinbaseOrderSigner),
+    ('kraken', HMACOrderSigner),
+])
+def test_get_order_signer(exchange, signer_class):
+    """Test signer selection by exchange id."""
+    assert type(get_order_signer(exchange)) is signer_class
+
+
+def test_get_order_signer_reuses_instance():
+    """Test signers are memoized per exchange id."""
+    assert get_order_signer('binance') is get_order_signer('BINANCE')
+    assert get_order_signer('binance') is not get_order_signer('binance_us')
@@ -0,0 +1,207 @@
+"""
+Tests for Secret Provider
+
+Tests credential storage using an in-memory stand-in for the OS keychain.
+"""
+
+import pytest
+import keyring
+from unittest.mock import patch
+from security.secret_provider import KeyringSecretProvider, EncryptedFileProvider
+
+
+@pytest.fixture
+def fake_keyring():
+    """In-memory replacement for the keyring get/set/delete functions."""
+    store = {}
+
+    def set_password(service, username, password):
+        store[(service, username)] = password
+
+    def get_password(service, username):
+        return store.get((service, username))
+
+    def delete_password(service, username):
+        if (service, username) not in store:
+            raise keyring.errors.PasswordDeleteError(username)
+        del store[(service, username)]
+
+    with patch.multiple(
+        'security.secret_provider.keyring',
+        set_password=set_password,
+        get_password=get_password,
+        delete_password=delete_password
+    ):
+        yield store
+
+
+class TestKeyringSecretProvider:
+    """Test KeyringSecretProvider class."""
+    
+    def test_store_and_get_key(self, fake_keyring):
+        """Test credentials round-trip through the keychain."""
+        provider = KeyringSecretProvider()
+        
+        provider.store_key('coinbase_pro', 'key', 'secret', 'phrase')
+        
+        assert provider.get_key('coinbase_pro') == ('key', 'secret', 'phrase')
+        assert provider.list_exchanges() == ['coinbase_pro']
+    
+    def test_get_key_missing(self, fake_keyring):
+        """Test missing credentials return None."""
+        provider = KeyringSecretProvider()
+        
+        assert provider.get_key('kraken') is None
+    
+    def test_get_key_is_cached(self, fake_keyring):
+        """Test repeated lookups are served from memory within the TTL."""
+        provider = KeyringSecretProvider(cache_ttl=300)
+        provider.store_key('binance_us', 'key', 'secret')
+        provider.get_key('binance_us')
+        
+        fake_keyring.clear()
+        
+        assert provider.get_key('binance_us') == ('key', 'secret', None)
+    
+    def test_cache_invalidated_on_store_and_delete(self, fake_keyring):
+        """Test store_key and delete_key drop cached credentials."""
+        provider = KeyringSecretProvider()
+        provider.store_key('binance_us', 'key', 'secret')
+        provider.get_key('binance_us')
+        
+        provider.store_key('binance_us', 'key2', 'secret2')
+        assert provider.get_key('binance_us') == ('key2', 'secret2', None)
+        
+        provider.delete_key('binance_us')
+        assert provider.get_key('binance_us') is None
+        assert provider.list_exchanges() == []
+    
+    def test_cache_disabled(self, fake_keyring):
+        """Test cache_ttl=0 always reads from the keychain."""
+        provider = KeyringSecretProvider(cache_ttl=0)
+        provider.store_key('binance_us', 'key', 'secret')
+        provider.get_key('binance_us')
+        
+        fake_keyring.clear()
+        
+        assert provider.get_key('binance_us') is None
+    
+    def test_store_key_single_write(self, fake_keyring):
+        """Test credentials are stored as one keychain entry."""
+        provider = KeyringSecretProvider()
+        
+        provider.store_key('kraken', 'key', 'secret')
+        
+        names = {username for _, username in fake_keyring}
+        assert names == {'kraken_creds', '_exchanges_list'}
+    
+    def test_exchanges_list_read_once(self, fake_keyring):
+        """Test listing exchanges is served from memory after the first read."""
+        provider = KeyringSecretProvider()
+        provider.store_key('kraken', 'key', 'secret')
+        
+        with patch('security.secret_provider.keyring.get_password') as get_password:
+            assert provider.list_exchanges() == ['kraken']
+        
+        get_password.assert_not_called()
+    
+    def test_exchanges_list_not_overwritten_by_stale_copy(self, fake_keyring):
+        """Test exchanges added by another instance survive this one's changes."""
+        first = KeyringSecretProvider()
+        second = KeyringSecretProvider()
+        first.store_key('kraken', 'key', 'secret')
+        
+        second.store_key('binance_us', 'key', 'secret')
+        first.store_key('coinbase_pro', 'key', 'secret', 'phrase')
+        first.delete_key('kraken')
+        
+        assert fake_keyring[(first.SERVICE_NAME, '_exchanges_list')] == 'binance_us,coinbase_pro'
+        assert first.list_exchanges() == ['binance_us', 'coinbase_pro']
+    
+    def test_exchange_recorded_when_list_unreadable(self, fake_keyring):
+        """Test store_key still records the exchange if the list can't be read."""
+        provider = KeyringSecretProvider()
+        
+        with patch.object(provider, '_read_exchanges_list', side_effect=RuntimeError('locked')):
+            provider.store_key('kraken', 'key', 'secret')
+        
+        assert fake_keyring[(provider.SERVICE_NAME, '_exchanges_list')] == 'kraken'
+    
+    def test_get_key_legacy_layout(self, fake_keyring):
+        """Test credentials stored one entry per field are still readable."""
+        service = KeyringSecretProvider.SERVICE_NAME
+        fake_keyring[(service, 'kraken_api_key')] = 'key'
+        fake_keyring[(service, 'kraken_api_secret')] = 'secret'
+        fake_keyring[(service, 'kraken_passphrase')] = 'phrase'
+        fake_keyring[(service, '_exchanges_list')] = 'kraken'
+        provider = KeyringSecretProvider()
+        
+        assert provider.get_key('kraken') == ('key', 'secret', 'phrase')
+        
+        provider.delete_key('kraken')
+        assert fake_keyring == {}
+    
+    def test_store_key_removes_legacy_entries(self, fake_keyring):
+        """Test storing credentials drops the legacy per-field entries."""
+        service = KeyringSecretProvider.SERVICE_NAME
+        fake_keyring[(service, 'kraken_api_key')] = 'old-key'
+        fake_keyring[(service, 'kraken_api_secret')] = 'old-secret'
+        provider = KeyringSecretProvider()
+        
+        provider.store_key('kraken', 'key', 'secret')
+        
+        names = {username for _, username in fake_keyring}
+        assert names == {'kraken_creds', '_exchanges_list'}
+    
+    @pytest.mark.parametrize('blob', ['not json', '[1]', '"text"', 'null'])
+    def test_get_key_corrupt_entry(self, fake_keyring, blob):
+        """Test an entry that is not a JSON object is treated as missing."""
+        fake_keyring[(KeyringSecretProvider.SERVICE_NAME, 'kraken_creds')] = blob
+        provider = KeyringSecretProvider()
+        
+        assert provider.get_key('kraken') is None
+
+
+class TestEncryptedFileProvider:
+    """Test EncryptedFileProvider class."""
+    
+    def test_store_and_get_key(self, tmp_path):
+        """Test credentials round-trip through the provider."""
+        provider = EncryptedFileProvider(tmp_path / 'credentials.enc')
+        
+        provider.store_key('kraken', 'key', 'secret', 'phrase')
+        
+        assert provider.get_key('kraken') == ('key', 'secret', 'phrase')
+        assert provider.list_exchanges() == ['kraken']
+    
+    def test_changes_written_immediately(self, tmp_path):
+        """Test stores and deletes reach the file before the call returns."""
+        path = tmp_path / 'credentials.enc'
+        provider = EncryptedFileProvider(path)
+        
+        provider.store_key('kraken', 'key', 'secret')
+        provider.store_key('binance_us', 'key2', 'secret2')
+        
+        reloaded = EncryptedFileProvider(path)
+        assert reloaded.get_key('kraken') == ('key', 'secret', None)
+        assert reloaded.get_key('binance_us') == ('key2', 'secret2', None)
+        
+        provider.delete_key('kraken')
+        
+        assert EncryptedFileProvider(path).get_key('kraken') is None
+    
+    def test_instances_share_the_file(self, tmp_path):
+        """Test two providers on one file see and keep each other's changes."""
+        path = tmp_path / 'credentials.enc'
+        first = EncryptedFileProvider(path)
+        second = EncryptedFileProvider(path)
+        assert second.list_exchanges() == []
+        
+        first.store_key('binance', 'key', 'secret')
+        assert second.get_key('binance') == ('key', 'secret', None)
+        
+        second.store_key('kraken', 'key2', 'secret2')
+        first.store_key('binance', 'key3', 'secret3')
+        
+        assert sorted(EncryptedFileProvider(path).list_exchanges()) == ['binance', 'kraken']
+        assert second.get_key('binance') == ('key3', 'secret3', None)